@@ -14,14 +14,24 @@ from ..config.settings import CONFIG
 from ..config.language import LANGUAGE
 from ..notify import NOTIFY
 from ..utils.sockets import *
-from ..utils.internet import send_request
-try:
-    from .web import app
-except ImportError as e:
-    CONFIG['API']['WebServer'] = False
-    CONFIG['API']['WebServer'].lock = True
-    NOTIFY(LANGUAGE.strings['Misc']['ImportFailed'], MODULE='web server', REASON=e)
-    app = None
+
+
+app = None
+
+
+def get_app():
+    """Import the web server the first time it's needed, as Flask is slow to load.
+    Returns None if the web server is disabled or failed to import.
+    """
+    global app
+    if app is None and CONFIG['API']['WebServer']:
+        try:
+            from .web import app
+        except ImportError as e:
+            CONFIG['API']['WebServer'] = False
+            CONFIG['API']['WebServer'].lock = True
+            NOTIFY(LANGUAGE.strings['Misc']['ImportFailed'], MODULE='web server', REASON=e)
+    return app
 
 
 def local_message_server(q_main, port=0, close_port=False, server_secret=None, q_feedback=None):
@@ -62,4 +72,5 @@ def local_address(port):
     
 def shutdown_server(port, timeout=1):
     """Send API request to shut down server."""
+    from ..utils.internet import send_request
     send_request('{}/status/terminate'.format(local_address(port)), timeout=timeout, output=True)
\ No newline at end of file
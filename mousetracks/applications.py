@@ -16,7 +16,6 @@ from .notify import NOTIFY
 from .files import format_file_path
 from .utils.compatibility import iteritems, unicode
 from .utils.os import get_running_processes, WindowFocus, get_modified_time, split_folder_and_file
-from .utils.internet import get_url_contents
 
 
 RECOGNISED_EXTENSIONS = ['exe', 'bin', 'app', 'scr', 'com']
@@ -93,6 +92,7 @@ class AppList(object):
                 return {}
                 
             #Read file from URL
+            from .utils.internet import get_url_contents
             try:
                 lines = get_url_contents(url).decode('utf-8').split('\n')
             except AttributeError:
@@ -282,6 +282,16 @@ LANGUAGE_DEFAULTS = {
             'value': 'Finished saving.',
             'level': 2
         },
+        'SaveCompleteProfile': {
+            '__info__': 'Valid Replacements: [APPLICATION-NAME] [SECONDS]',
+            'value': 'Saved [APPLICATION-NAME] in [SECONDS] seconds.',
+            'level': 1
+        },
+        'SaveFailedProfile': {
+            '__info__': 'Valid Replacements: [APPLICATION-NAME] [REASON]',
+            'value': 'Failed to save [APPLICATION-NAME] ([REASON]).',
+            'level': 2
+        },
         'SaveIncompleteNoRetry': {
             'value': 'Unable to save file, make sure this has the correct permissions.',
             'level': 2
@@ -115,6 +115,46 @@ CONFIG_DEFAULTS = {
             'value': 5,
             'type': int,
             'min': 0
+        },
+        'Threads': {
+            '__info__': 'How many profiles can be saved at the same time.',
+            'value': 2,
+            'type': int,
+            'min': 1
+        },
+        'JournalLength': {
+            '__info__': 'How many saves only write the changes to a journal before the full file is saved again. Set to 0 to disable.',
+            'value': 10,
+            'type': int,
+            'min': 0
+        },
+        'MapCompression': {
+            '__info__': 'Compression used for the maps when saving. Using "stored" makes the files larger, but maps can be read straight from the disk when rendering.',
+            'value': 'deflate',
+            'type': str,
+            'case_sensitive': False,
+            'valid': ('stored', 'deflate', 'bzip2', 'lzma')
+        },
+        'MapCompressionLevel': {
+            '__info__': 'Compression level for the maps, from 0 to 9. This only applies to deflate and bzip2. Set to -1 for the default.',
+            'value': -1,
+            'type': int,
+            'min': -1,
+            'max': 9
+        },
+        'DataCompression': {
+            '__info__': 'Compression used for everything other than the maps when saving.',
+            'value': 'deflate',
+            'type': str,
+            'case_sensitive': False,
+            'valid': ('stored', 'deflate', 'bzip2', 'lzma')
+        },
+        'DataCompressionLevel': {
+            '__info__': 'Compression level for everything other than the maps, from 0 to 9. Set to -1 for the default.',
+            'value': -1,
+            'type': int,
+            'min': -1,
+            'max': 9
         }
     },
     'GenerateImages': {
@@ -167,6 +207,13 @@ CONFIG_DEFAULTS = {
             '__info__': 'Open the folder containing the image(s) once the render is complete.',
             'value': True,
             'type': bool
+        },
+        'RenderProcesses': {
+            '__priority__': 7,
+            '__info__': 'How many images to render at the same time. Set to 0 to use one for each CPU core.',
+            'value': 2,
+            'type': int,
+            'min': 0
         }
     },
     'GenerateTracks': {
@@ -376,6 +423,35 @@ CONFIG_DEFAULTS = {
             'type': float,
             'min': 1.001
         },
+        'EventBatchSize': {
+            '__info__': 'Maximum number of ticks to group together before sending to the background process.',
+            'value': 15,
+            'type': int,
+            'min': 1
+        },
+        'EventBatchLatency': {
+            '__info__': 'Maximum time in milliseconds to wait before sending any grouped ticks.',
+            'value': 250,
+            'type': int,
+            'min': 0
+        },
+        'SharedMemoryQueue': {
+            '__info__': 'Send data to the background process through shared memory instead of a pipe. Requires Python 3.8 or above.',
+            'value': False,
+            'type': bool
+        },
+        'SharedMemoryQueueSize': {
+            '__info__': 'Size of the shared memory in kilobytes. Data will be held back if the background process falls this far behind.',
+            'value': 4096,
+            'type': int,
+            'min': 64
+        },
+        'MapTileSize': {
+            '__info__': 'Split each map into tiles of this size, and only use memory for the tiles with data. Set to 0 to disable.',
+            'value': 0,
+            'type': int,
+            'min': 0
+        },
         'CheckResolution': {
             '__info__': 'How many ticks to wait between checking the resolution.',
             'value': 60,
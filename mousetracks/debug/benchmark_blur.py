@@ -0,0 +1,68 @@
+"""This is part of the Mouse Tracks Python application.
+Source: https://github.com/Peter92/MouseTracks
+"""
+#Compare the speed and accuracy of each gaussian blur method
+#Run with "python -m mousetracks.debug.benchmark_blur"
+#The accuracy is checked on a cropped array, against a reference that doesn't share any code with the blur
+
+from __future__ import absolute_import, division
+
+import random
+import time
+
+import numpy as np
+
+from ..image.calculate import gaussian_size
+from ..utils import numpy
+from ..utils.compatibility import Message, range
+
+
+#Upscaled resolutions of a 1080p and 4K screen with HighPrecision enabled
+RESOLUTIONS = ((3840, 2160), (7680, 4320))
+
+#Size of the top left corner used to check the accuracy, so the edges are included
+CROP_SIZE = (1024, 576)
+
+
+def _reference(array, sigma, truncate=4.0):
+    """Blur each axis with numpy.convolve.
+    This matches scipy.ndimage.gaussian_filter, where "reflect" is the same as "symmetric" padding.
+    """
+    radius = int(truncate * sigma + 0.5)
+    x = np.arange(-radius, radius + 1, dtype=np.float64)
+    kernel = np.exp(-0.5 * (x / sigma) ** 2)
+    kernel /= kernel.sum()
+
+    array = np.asarray(array, dtype=np.float64)
+    for axis in (0, 1):
+        lines = np.moveaxis(array, axis, -1)
+        padded = np.pad(lines, ((0, 0), (radius, radius)), mode='symmetric')
+        lines = np.array([np.convolve(line, kernel, mode='valid') for line in padded])
+        array = np.moveaxis(lines, -1, axis)
+    return array
+
+
+if __name__ == '__main__':
+    random.seed(0)
+    for width, height in RESOLUTIONS:
+        array = numpy.array((width, height), create=True, dtype='float64')
+        indices = ([random.randrange(height) for _ in range(5000)], [random.randrange(width) for _ in range(5000)])
+        array = numpy.add_at(array, indices, 1)
+        sigma = gaussian_size(width, height)
+        Message('{}x{} (sigma {}, {} picked by default):'.format(width, height, sigma, numpy.blur_method(sigma)))
+
+        cropped = array[:CROP_SIZE[1], :CROP_SIZE[0]]
+        reference = _reference(cropped, sigma)
+        highest = np.max(reference)
+
+        #The direct method is only timed for small blurs as it's very slow
+        for method in ('direct', 'fft', 'box'):
+            for dtype in ('float64', 'float32'):
+                if method == 'direct' and sigma > numpy.BLUR_DIRECT_MAX:
+                    time_taken = 'not timed'
+                else:
+                    start = time.time()
+                    numpy.gaussian_blur(array, sigma, method=method, dtype=dtype)
+                    time_taken = '{:.2f}s'.format(time.time() - start)
+                error = np.max(abs(numpy.gaussian_blur(cropped, sigma, method=method, dtype=dtype) - reference)) / highest
+                Message('    {} ({}): {}, max error {:.2e} of the highest value'.format(method, dtype, time_taken, error))
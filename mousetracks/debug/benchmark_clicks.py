@@ -0,0 +1,65 @@
+"""This is part of the Mouse Tracks Python application.
+Source: https://github.com/Peter92/MouseTracks
+"""
+#Compare upscaling each click array with only upscaling the clicks
+#Run with "python -m mousetracks.debug.benchmark_clicks"
+#This requires scipy, as the original method uses it for upscaling
+
+from __future__ import absolute_import, division
+
+import random
+import sys
+import time
+
+from ..image.calculate import arrays_to_heatmap, gaussian_size, upscale_and_add_arrays, upscale_arrays_to_resolution
+from ..utils import numpy
+from ..utils.compatibility import Message, range
+
+
+#Recorded resolutions, and the upscaled resolution of a 4K screen with HighPrecision enabled
+RESOLUTIONS = ((1920, 1080), (2560, 1440), (3840, 2160))
+
+UPSCALE_RESOLUTION = (7680, 4320)
+
+CLICKS = 20000
+
+
+if __name__ == '__main__':
+    try:
+        from ..image.scipy.zoom import zoom
+    except ImportError:
+        try:
+            from scipy.ndimage.interpolation import zoom
+        except ImportError:
+            Message('scipy is required to run the original method.')
+            sys.exit(1)
+
+    random.seed(0)
+    clicks = {}
+    for width, height in RESOLUTIONS:
+        buttons = []
+        for button in range(3):
+            array = numpy.array((width, height), create=True, dtype='int64')
+            indices = ([random.randrange(height) for _ in range(CLICKS)], [random.randrange(width) for _ in range(CLICKS)])
+            buttons.append(numpy.add_at(array, indices, 1))
+        clicks[(width, height)] = buttons
+    sigma = gaussian_size(*UPSCALE_RESOLUTION)
+
+    start = time.time()
+    upscaled = upscale_arrays_to_resolution(clicks, UPSCALE_RESOLUTION)
+    expected = numpy.merge(upscaled, 'add', 'float64')
+    del upscaled
+    original_time = time.time() - start
+
+    start = time.time()
+    result = upscale_and_add_arrays(clicks, UPSCALE_RESOLUTION)
+    new_time = time.time() - start
+    if not (result == expected).all():
+        Message('The upscaled clicks do not match')
+    Message('Upscale and merge: original {:.2f}s, only clicks {:.2f}s ({:.0f}x faster)'.format(original_time, new_time, original_time / new_time))
+
+    #Check the final heatmap, as the remap hides any small differences
+    (min_expected, max_expected), expected = arrays_to_heatmap(expected, sigma, 0.995)
+    (min_value, max_value), result = arrays_to_heatmap(result, sigma, 0.995)
+    error = numpy.max(abs(result - expected)) / (max_expected - min_expected)
+    Message('Heatmap max error: {:.2e}'.format(error))
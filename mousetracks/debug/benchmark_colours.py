@@ -0,0 +1,49 @@
+"""This is part of the Mouse Tracks Python application.
+Source: https://github.com/Peter92/MouseTracks
+"""
+#Compare converting arrays to RGB with a list of colours and with a lookup table
+#Run with "python -m mousetracks.debug.benchmark_colours"
+
+from __future__ import absolute_import, division
+
+import random
+import time
+
+from ..image.colours import ColourRange
+from ..utils import numpy
+from ..utils.compatibility import Message, range
+
+
+RESOLUTIONS = ((3840, 2160), (7680, 4320))
+
+
+def _convert_to_rgb_list(colour_range, array):
+    """The original method of looking up each value separately."""
+    new = numpy.round(numpy.divide(array - colour_range.min, colour_range._step_size), 0, 'int64')
+    start_colour = colour_range.cache[0]
+    end_colour = colour_range.cache[-1]
+    colour_array = [[colour_range.cache[item] if 0 <= item <= colour_range.steps
+                     else start_colour if item < 0
+                     else end_colour for item in sublst]
+                    for sublst in new.tolist()]
+    return numpy.array(colour_array, dtype='uint8')
+
+
+if __name__ == '__main__':
+    random.seed(0)
+    colour_range = ColourRange(0, 1, [(0, 0, 0), (0, 0, 127), (0, 0, 255), (0, 255, 255), (255, 255, 255)])
+    for width, height in RESOLUTIONS:
+        array = numpy.array((width, height), create=True, dtype='float64')
+        indices = ([random.randrange(height) for _ in range(100000)], [random.randrange(width) for _ in range(100000)])
+        array = numpy.assign(array, indices, [random.uniform(-0.1, 1.1) for _ in range(100000)])
+
+        start = time.time()
+        expected = _convert_to_rgb_list(colour_range, array)
+        list_time = time.time() - start
+        start = time.time()
+        result = colour_range.convert_to_rgb(array)
+        lut_time = time.time() - start
+        if not (result == expected).all():
+            Message('{}x{}: the results do not match'.format(width, height))
+        del expected, result
+        Message('{}x{}: list {:.2f}s, lookup table {:.2f}s ({:.0f}x faster)'.format(width, height, list_time, lut_time, list_time / lut_time))
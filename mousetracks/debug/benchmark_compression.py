@@ -0,0 +1,69 @@
+"""This is part of the Mouse Tracks Python application.
+Source: https://github.com/Peter92/MouseTracks
+"""
+#Compare the save time, load time and file size of each compression type
+#Run with "python -m mousetracks.debug.benchmark_compression [profile names]"
+#If no profiles are given, the 5 largest in the data folder will be used
+
+from __future__ import absolute_import, division
+
+import sys
+import timeit
+
+from ..config.settings import CONFIG
+from ..files import LoadData, prepare_file, decode_file, get_data_files
+from ..misc import CustomOpen, ZIP_CODECS
+from ..utils import numpy
+from ..utils.compatibility import Message, BytesIO
+from ..versions import IterateMaps
+
+
+SETTINGS = (('stored', -1), ('deflate', 1), ('deflate', -1), ('deflate', 9),
+            ('bzip2', 1), ('bzip2', 9), ('lzma', -1))
+
+
+def _load_maps(data):
+    """Load every map into memory, so only the compression is being timed."""
+    numpy_maps = IterateMaps(data['Resolution']).separate()
+    IterateMaps(data['Resolution']).join([numpy.array(m) for m in numpy_maps])
+    return data
+
+
+def _decode(saved):
+    with CustomOpen(BytesIO(saved), 'rb') as f:
+        return _load_maps(decode_file(f))
+
+
+def _benchmark(data, codec, level):
+    """Returns the save time, load time and size of a profile."""
+    CONFIG['Save']['MapCompression'] = CONFIG['Save']['DataCompression'] = codec
+    CONFIG['Save']['MapCompressionLevel'] = CONFIG['Save']['DataCompressionLevel'] = level
+    save_time = min(timeit.repeat(lambda: prepare_file(data), number=1, repeat=3))
+    saved = prepare_file(data)
+    load_time = min(timeit.repeat(lambda: _decode(saved), number=1, repeat=3))
+    return save_time, load_time, len(saved)
+
+
+if __name__ == '__main__':
+    profiles = sys.argv[1:]
+    if not profiles:
+        data_files = get_data_files()
+        profiles = sorted(data_files, key=lambda k: int((data_files[k] or {}).get('filesize', 0)), reverse=True)[:5]
+    if not profiles:
+        Message('No profiles found.')
+
+    original = {k: CONFIG['Save'][k] for k in ('MapCompression', 'MapCompressionLevel', 'DataCompression', 'DataCompressionLevel')}
+    try:
+        for profile in profiles:
+            data = _load_maps(LoadData(profile, _update_metadata=False))
+            Message('{}:'.format(profile))
+            for codec, level in SETTINGS:
+                if codec not in ZIP_CODECS:
+                    Message('    {} is not supported on this version of Python.'.format(codec))
+                    continue
+                save_time, load_time, size = _benchmark(data, codec, level)
+                Message('    {} (level {}): save {:.1f}ms, load {:.1f}ms, {:.2f}MB'.format(
+                        codec, 'default' if level < 0 else level, save_time * 1000, load_time * 1000, size / 1024 / 1024))
+    finally:
+        for k, v in original.items():
+            CONFIG['Save'][k] = v
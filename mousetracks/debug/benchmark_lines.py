@@ -0,0 +1,77 @@
+"""This is part of the Mouse Tracks Python application.
+Source: https://github.com/Peter92/MouseTracks
+"""
+#Compare the speed and pixels of the line calculations
+#Run with "python -m mousetracks.debug.benchmark_lines"
+
+from __future__ import absolute_import, division
+
+import random
+import timeit
+
+from ..utils import numpy
+from ..utils.compatibility import Message, range
+from ..utils.maths import calculate_line
+
+
+def _random_path(length, distance):
+    """Generate a random mouse path."""
+    x = y = 0
+    path = [(x, y)]
+    for _ in range(length):
+        x += random.randint(-distance, distance)
+        y += random.randint(-distance, distance)
+        path.append((x, y))
+    return path
+
+
+def _old_method(path):
+    for start, end in zip(path[:-1], path[1:]):
+        [start] + calculate_line(start, end) + [end]
+
+
+def _new_method(path):
+    for start, end in zip(path[:-1], path[1:]):
+        numpy.calculate_lines([start, end])
+
+
+def _new_method_path(path):
+    numpy.calculate_lines(path)
+
+
+def _compare_pixels(path):
+    """Count the segments and pixels that are different between the two methods."""
+    segments = pixels = 0
+    for start, end in zip(path[:-1], path[1:]):
+        if start == end:
+            continue
+        old = set([start] + calculate_line(start, end) + [end])
+        xs, ys = numpy.calculate_lines([start, end])
+        new = set(zip(xs.tolist(), ys.tolist()))
+        if old != new:
+            segments += 1
+            pixels += len(old - new)
+    return segments, pixels
+
+
+if __name__ == '__main__':
+    random.seed(0)
+    Message('Time to calculate 60 lines (1 second of tracking):')
+    for distance in (5, 50, 500):
+        path = _random_path(60, distance)
+        pixels = numpy.calculate_lines(path)[0].size
+        results = []
+        for method in (_old_method, _new_method, _new_method_path):
+            timer = timeit.Timer(lambda: method(path))
+            loops = max(1, int(0.2 / min(timer.repeat(1, 1))))
+            results.append(min(timer.repeat(3, loops)) / loops * 1000)
+        Message('Max {}px per tick ({} pixels): calculate_line {:.3f}ms, calculate_lines per segment {:.3f}ms, '
+                'calculate_lines for whole path {:.3f}ms'.format(distance, pixels, *results))
+
+    #The old method uses floats, so may step differently where a line passes through the corner of a pixel
+    Message('Difference between calculate_line and calculate_lines for 10000 lines:')
+    for distance in (5, 50, 500):
+        path = _random_path(10000, distance)
+        total = numpy.calculate_lines(path)[0].size
+        segments, pixels = _compare_pixels(path)
+        Message('Max {}px per tick: {} lines are different, with {} of {} pixels moved'.format(distance, segments, pixels, total))
@@ -0,0 +1,72 @@
+"""This is part of the Mouse Tracks Python application.
+Source: https://github.com/Peter92/MouseTracks
+"""
+#Compare the throughput of the queues used to send data to the background process
+#Run with "python -m mousetracks.debug.benchmark_queue"
+
+from __future__ import absolute_import, division
+
+import time
+from multiprocessing import Process, Queue
+
+from ..track.batch import FrameBatch
+from ..utils.compatibility import Message, range
+from ..utils.ringbuffer import RingBuffer
+
+
+EVENTS = 20000
+
+
+def _frame(i):
+    """Generate the data for a typical tick."""
+    return {'Ticks': {'Total': 1, 'Idle': 0},
+            'MouseMove': [(i % 1920, i % 1080), ((i + 5) % 1920, (i + 3) % 1080), []]}
+
+
+def _consume(q_recv, q_send):
+    """Read messages until None is received, then report back."""
+    while q_recv.get() is not None:
+        pass
+    q_send.put(time.time())
+
+
+def _run(queue, batch_size):
+    q_done = Queue()
+    process = Process(target=_consume, args=(queue, q_done))
+    process.start()
+
+    frames = [_frame(i) for i in range(EVENTS)]
+    start = time.time()
+    if batch_size:
+        batch = FrameBatch(queue, batch_size)
+        for frame_data in frames:
+            batch.add(frame_data)
+        batch.flush()
+    else:
+        for frame_data in frames:
+            queue.put(frame_data)
+    queue.put(None)
+
+    end = q_done.get()
+    process.join()
+    return EVENTS / (end - start)
+
+
+if __name__ == '__main__':
+    transports = [('Queue', Queue)]
+    if RingBuffer.supported:
+        transports.append(('RingBuffer', RingBuffer))
+    else:
+        Message('Shared memory is not supported on this version of Python.')
+
+    Message('Events sent to another process per second:')
+    for batch_size in (0, 15, 60):
+        results = []
+        for name, transport in transports:
+            queue = transport()
+            results.append('{} {:.0f}'.format(name, _run(queue, batch_size)))
+            try:
+                queue.close()
+            except AttributeError:
+                pass
+        Message('{}: {}'.format('Batches of {}'.format(batch_size) if batch_size else 'No batching', ', '.join(results)))
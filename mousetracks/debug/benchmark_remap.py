@@ -0,0 +1,55 @@
+"""This is part of the Mouse Tracks Python application.
+Source: https://github.com/Peter92/MouseTracks
+"""
+#Compare remapping a click heatmap to a 0-n range with a dictionary and with numpy
+#Run with "python -m mousetracks.debug.benchmark_remap"
+
+from __future__ import absolute_import, division
+
+import random
+import time
+
+from ..utils import numpy
+from ..utils.compatibility import Message, range
+
+
+def _remap_to_range_dict(array):
+    """The original method of looking up each value in a dictionary."""
+    values = {v: i for i, v in enumerate(sorted(set(array.ravel())))}
+    return numpy.convert_to_dict(array, values)
+
+
+def _click_array(resolution, clicks, scale):
+    """Create a click array that has been upscaled for high precision.
+    The clicks are grouped around a few points, like buttons in a game.
+    """
+    width, height = resolution
+    array = numpy.array((width * scale, height * scale), create=True, dtype='float64')
+    centres = [(random.randrange(width), random.randrange(height)) for _ in range(50)]
+    xs = []
+    ys = []
+    for _ in range(clicks):
+        x, y = random.choice(centres)
+        xs.append(min(max(0, int(random.gauss(x, 20))), width - 1))
+        ys.append(min(max(0, int(random.gauss(y, 20))), height - 1))
+    for i in range(scale):
+        for j in range(scale):
+            array = numpy.add_at(array, ([y * scale + i for y in ys], [x * scale + j for x in xs]), 1)
+    return array
+
+
+if __name__ == '__main__':
+    random.seed(0)
+    for resolution, clicks in (((1920, 1080), 20000), ((2560, 1440), 100000), ((3840, 2160), 100000)):
+        array = _click_array(resolution, clicks, 2)
+        
+        start = time.time()
+        expected = _remap_to_range_dict(array)
+        dict_time = time.time() - start
+        start = time.time()
+        result = numpy.remap_to_range(array)
+        numpy_time = time.time() - start
+        if not (result == expected).all() or result.dtype != expected.dtype:
+            Message('{}x{}: the results do not match'.format(*resolution))
+        Message('{}x{} ({} clicks, upscaled to {}x{}): dictionary {:.2f}s, numpy {:.2f}s ({:.0f}x faster)'.format(
+                resolution[0], resolution[1], clicks, array.shape[1], array.shape[0], dict_time, numpy_time, dict_time / numpy_time))
@@ -0,0 +1,55 @@
+"""This is part of the Mouse Tracks Python application.
+Source: https://github.com/Peter92/MouseTracks
+"""
+#Compare the memory usage of dense and tiled maps
+#Run with "python -m mousetracks.debug.benchmark_tiles"
+
+from __future__ import absolute_import, division
+
+import random
+import timeit
+
+from ..utils import numpy
+from ..utils.compatibility import Message, range
+
+
+MAPS_PER_RESOLUTION = 13
+
+TILE_SIZE = 128
+
+
+def _random_path(resolution, length, distance):
+    """Generate a random mouse path that stays within the screen."""
+    width, height = resolution
+    x, y = width // 2, height // 2
+    path = [(x, y)]
+    for _ in range(length):
+        x = sorted((0, x + random.randint(-distance, distance), width - 1))[1]
+        y = sorted((0, y + random.randint(-distance, distance), height - 1))[1]
+        path.append((x, y))
+    return path
+
+
+def _record(array, path):
+    xs, ys = numpy.calculate_lines(path)
+    numpy.assign(array, (ys, xs), 1)
+
+
+if __name__ == '__main__':
+    random.seed(0)
+    Message('Memory used by {} maps for each resolution:'.format(MAPS_PER_RESOLUTION))
+    for resolution in ((1920, 1080), (3840, 2160), (7680, 2160)):
+        for ticks in (60 * 60, 60 * 60 * 10):
+            path = _random_path(resolution, ticks, 20)
+
+            dense = numpy.array(resolution, create=True)
+            tiled = numpy.array(resolution, create=True, tile_size=TILE_SIZE)
+            dense_time = min(timeit.repeat(lambda: _record(dense, path), number=1, repeat=3)) * 1000
+            tiled_time = min(timeit.repeat(lambda: _record(tiled, path), number=1, repeat=3)) * 1000
+
+            #Only the tracks map is written to, so assume the others are empty
+            dense_size = dense.nbytes * MAPS_PER_RESOLUTION / 1024 / 1024
+            tiled_size = tiled.nbytes / 1024 / 1024
+            Message('{}x{}, {} ticks of movement: dense {:.1f}MB ({:.1f}ms), tiled {:.1f}MB ({:.1f}ms, {} of {} tiles)'.format(
+                    resolution[0], resolution[1], ticks, dense_size, dense_time, tiled_size, tiled_time,
+                    len(tiled.tiles), ((resolution[0] - 1) // TILE_SIZE + 1) * ((resolution[1] - 1) // TILE_SIZE + 1)))
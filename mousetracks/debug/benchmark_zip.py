@@ -0,0 +1,73 @@
+"""This is part of the Mouse Tracks Python application.
+Source: https://github.com/Peter92/MouseTracks
+"""
+#Compare loading and saving lazy loaded maps when reopening the zip file every time
+#Run with "python -m mousetracks.debug.benchmark_zip"
+
+from __future__ import absolute_import, division
+
+import os
+import random
+import tempfile
+import timeit
+
+from ..files import LoadData, prepare_file, decode_file
+from ..misc import CustomOpen, cached_open, close_cached
+from ..track.background import check_resolution
+from ..utils import numpy
+from ..utils.compatibility import Message, range
+from ..versions import IterateMaps
+
+
+def _create_profile(path, resolutions):
+    """Save a profile with some data on every resolution."""
+    data = LoadData(empty=True)
+    for i in range(resolutions):
+        resolution = (320 + i, 180 + i)
+        check_resolution(data, resolution)
+        maps = data['Resolution'][resolution]
+        ys = [random.randrange(resolution[1]) for _ in range(100)]
+        xs = [random.randrange(resolution[0]) for _ in range(100)]
+        maps['Tracks'] = numpy.assign(maps['Tracks'], (ys, xs), 1000)
+    with open(path, 'wb') as f:
+        f.write(prepare_file(data))
+
+
+def _decode(path):
+    with CustomOpen(path, 'rb') as f:
+        return decode_file(f, lazy_load_path=path)
+
+
+def _load(path):
+    """Load every map in the profile."""
+    for m in IterateMaps(_decode(path)['Resolution']).separate():
+        m.array
+
+
+def _save(path):
+    """Save the profile without loading any maps."""
+    prepare_file(_decode(path))
+
+
+def _open(path):
+    return CustomOpen(path, 'rb')
+
+
+if __name__ == '__main__':
+    random.seed(0)
+    path = os.path.join(tempfile.gettempdir(), 'mousetracks-benchmark.mtk')
+    Message('Time taken to load and save profiles (reopening every time / reusing the zip):')
+    try:
+        for resolutions in (1, 10, 50):
+            _create_profile(path, resolutions)
+            results = []
+            for name, func in (('load', _load), ('save', _save)):
+                numpy.cached_open = _open
+                reopen_time = min(timeit.repeat(lambda: func(path), number=1, repeat=5)) * 1000
+                numpy.cached_open = cached_open
+                reuse_time = min(timeit.repeat(lambda: func(path), number=1, repeat=5)) * 1000
+                results.append('{} {:.1f}ms / {:.1f}ms'.format(name, reopen_time, reuse_time))
+            Message('{} resolutions ({} maps): {}'.format(resolutions, resolutions * 13, ', '.join(results)))
+    finally:
+        close_cached(path)
+        os.remove(path)
@@ -0,0 +1,38 @@
+"""This is part of the Mouse Tracks Python application.
+Source: https://github.com/Peter92/MouseTracks
+"""
+#Merge multiple profiles into a new profile
+#Run with "python -m mousetracks.debug.merge_profiles [new profile] [profile names]"
+
+from __future__ import absolute_import
+
+import os
+import sys
+import time
+from tempfile import mkstemp
+
+from ..files import DATA_EXTENSION, merge_profiles, save_data
+from ..misc import close_cached
+from ..utils.compatibility import Message
+from ..utils.os import remove_file
+
+
+if __name__ == '__main__':
+    if len(sys.argv) < 4:
+        Message('Usage: python -m mousetracks.debug.merge_profiles [new profile] [profile names]')
+        sys.exit(1)
+    new_profile = sys.argv[1]
+    profiles = sys.argv[2:]
+
+    handle, path = mkstemp(suffix=DATA_EXTENSION)
+    os.close(handle)
+    try:
+        start = time.time()
+        data = merge_profiles(profiles, path=path, name=new_profile)
+        if save_data(new_profile, data):
+            Message('Merged {} profiles into "{}" in {:.2f} seconds.'.format(len(profiles), new_profile, time.time() - start))
+        else:
+            Message('Failed to save "{}".'.format(new_profile))
+    finally:
+        close_cached(path)
+        remove_file(path)
@@ -0,0 +1,18 @@
+"""This is part of the Mouse Tracks Python application.
+Source: https://github.com/Peter92/MouseTracks
+"""
+#Read the metadata from every profile again, in case the catalog is out of date
+#Run with "python -m mousetracks.debug.rebuild_catalog"
+
+from __future__ import absolute_import
+
+import time
+
+from ..files import DATA_FOLDER, get_data_files
+from ..utils.compatibility import Message
+
+
+if __name__ == '__main__':
+    start = time.time()
+    data_files = get_data_files(rebuild=True)
+    Message('Rebuilt the catalog of {} profiles in {} in {:.2f} seconds.'.format(len(data_files), DATA_FOLDER, time.time() - start))
@@ -0,0 +1,61 @@
+"""This is part of the Mouse Tracks Python application.
+Source: https://github.com/Peter92/MouseTracks
+"""
+#Show how long each part of the code takes to import when starting
+#Run with "python -m mousetracks.debug.startup_time [module names]"
+#Requires Python 3.7 or later for the "-X importtime" option
+
+from __future__ import absolute_import, division
+
+import subprocess
+import sys
+from collections import defaultdict
+
+from ..utils.compatibility import Message
+
+
+MODULES = ('mousetracks.track', 'mousetracks.image')
+
+
+def _subsystem(name):
+    """Group modules by the package they belong to.
+    Anything in mousetracks is grouped by the subpackage instead.
+    """
+    parts = name.split('.')
+    if parts[0] == 'mousetracks':
+        return '.'.join(parts[:2])
+    return parts[0]
+
+
+def import_times(module):
+    """Import a module in a new process and get the time taken by each subsystem.
+    Returns the total time and a dictionary of times, in microseconds.
+    """
+    process = subprocess.Popen([sys.executable, '-X', 'importtime', '-c', 'import {}'.format(module)],
+                               stdout=subprocess.PIPE, stderr=subprocess.PIPE, universal_newlines=True)
+    output = process.communicate()[1]
+
+    #Each line is "import time: self | cumulative | name"
+    times = defaultdict(int)
+    total = 0
+    for line in output.splitlines():
+        if not line.startswith('import time:') or 'self [us]' in line:
+            continue
+        self_time, cumulative, name = line[12:].split('|')
+        times[_subsystem(name.strip())] += int(self_time)
+        if not name.startswith('  '):
+            total += int(cumulative)
+    return total, times
+
+
+if __name__ == '__main__':
+    if sys.version_info < (3, 7):
+        Message('Python 3.7 or later is required.')
+        sys.exit(1)
+
+    for module in sys.argv[1:] or MODULES:
+        total, times = import_times(module)
+        Message('{}: {:.1f}ms'.format(module, total / 1000))
+        for name, time_taken in sorted(times.items(), key=lambda kv: kv[1], reverse=True):
+            if time_taken >= 1000:
+                Message('    {}: {:.1f}ms'.format(name, time_taken / 1000))
@@ -0,0 +1,105 @@
+"""This is part of the Mouse Tracks Python application.
+Source: https://github.com/Peter92/MouseTracks
+"""
+#Upgrade every profile to the latest file version, so it doesn't need to be done when tracking
+#Run with "python -m mousetracks.debug.upgrade_profiles [--recompress] [--processes N] [profile names]"
+#Use --recompress to save every profile with the current compression settings, even if up to date
+
+from __future__ import absolute_import
+
+import argparse
+import time
+from functools import partial
+from multiprocessing import Pool, cpu_count
+
+from ..files import LoadData, Lock, decode_file, get_data_files, prepare_file, save_data, unload_data, _get_paths
+from ..misc import CustomOpen
+from ..utils import numpy
+from ..utils.compatibility import Message, BytesIO
+from ..utils.os import file_exists
+from ..versions import FILE_VERSION, IterateMaps
+
+
+def _verify(saved):
+    """Check a saved profile can be read, and return the reason if not."""
+    with CustomOpen(BytesIO(saved), 'rb') as f:
+        corrupted = f.zip.testzip()
+        if corrupted is not None:
+            return 'bad checksum for {}'.format(corrupted)
+        data = decode_file(f, lazy_load_path='')
+        if data['FileVersion'] != FILE_VERSION:
+            return 'file version is {}'.format(data['FileVersion'])
+
+        #Read each map one at a time to check the resolution
+        for resolution, maps in data['Resolution'].items():
+            for m in IterateMaps(maps).separate():
+                array = numpy.load(f.read('maps/{}.npy'.format(m.index)))
+                if array.shape != resolution[::-1]:
+                    return 'map {} is {}x{} instead of {}x{}'.format(m.index, array.shape[1], array.shape[0], *resolution)
+    return None
+
+
+def upgrade_profile(profile, recompress=False):
+    """Upgrade a single profile and save it if successful.
+    Returns the profile name, result and time taken.
+    """
+    start = time.time()
+    paths = _get_paths(profile)
+    try:
+        with CustomOpen(paths['Main'], 'rb') as f:
+            file_version = decode_file(f, legacy=f.zip is None, lazy_load_path=paths['Main']).get('FileVersion')
+        if file_version == FILE_VERSION and not recompress and not file_exists(paths['Journal']):
+            return profile, 'up to date', time.time() - start
+
+        data = LoadData(profile, _reset_sessions=False)
+
+        #Mark every map as edited so they aren't copied from the old file
+        if recompress:
+            numpy_maps = IterateMaps(data['Resolution']).separate()
+            for m in numpy_maps:
+                if isinstance(m, numpy.LazyLoader):
+                    m.edited()
+            IterateMaps(data['Resolution']).join(numpy_maps)
+
+        #Keep the modified time, as it's used to decide when to start a new session
+        saved = prepare_file(data, _update_modified=False)
+        error = _verify(saved)
+        if error is not None:
+            return profile, 'failed ({})'.format(error), time.time() - start
+        if not save_data(profile, saved, _compress=False):
+            return profile, 'failed to save', time.time() - start
+        unload_data(profile)
+
+    except Exception as e:
+        return profile, 'failed ({}: {})'.format(type(e).__name__, e), time.time() - start
+    if file_version == FILE_VERSION:
+        return profile, 'saved', time.time() - start
+    return profile, 'upgraded from version {}'.format(file_version), time.time() - start
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser()
+    parser.add_argument('profiles', nargs='*')
+    parser.add_argument('--recompress', action='store_true')
+    parser.add_argument('--processes', type=int, default=cpu_count())
+    args = parser.parse_args()
+
+    #Make sure the profiles aren't being tracked at the same time
+    with Lock() as locked:
+        if not locked:
+            Message('Mouse Tracks must be closed before upgrading profiles.')
+
+        else:
+            profiles = args.profiles or sorted(get_data_files())
+            start = time.time()
+            pool = Pool(max(1, min(args.processes, len(profiles))))
+            try:
+                results = pool.imap_unordered(partial(upgrade_profile, recompress=args.recompress), profiles)
+                for i, (profile, result, time_taken) in enumerate(results):
+                    Message('[{}/{}] {}: {} ({:.2f}s)'.format(i + 1, len(profiles), profile, result, time_taken))
+            finally:
+                pool.close()
+                pool.join()
+
+            get_data_files(rebuild=True)
+            Message('Finished in {:.2f} seconds.'.format(time.time() - start))
@@ -5,18 +5,21 @@ Source: https://github.com/Peter92/MouseTracks
 
 from __future__ import absolute_import
 
+import atexit
 import time
 import zlib
 import os
+import struct
 import sys
+import threading
 import zipfile
 from operator import itemgetter
-from tempfile import gettempdir
+from tempfile import gettempdir, mkstemp
 
 from .utils import numpy
 from .config.settings import CONFIG
 from .constants import DEFAULT_NAME, MAX_INT
-from .misc import CustomOpen, format_file_path, format_name
+from .misc import CustomOpen, close_cached, format_file_path, format_name, replacing_file
 from .utils.compatibility import PYTHON_VERSION, ModuleNotFoundError, BytesIO, unicode, pickle, iteritems, BytesIO
 from .utils.os import remove_file, rename_file, create_folder, hide_file, get_modified_time, list_directory, file_exists, get_file_size
 from .versions import VERSION, FILE_VERSION, upgrade_version, IterateMaps
@@ -36,10 +39,21 @@ DATA_TEMP_FOLDER = '.temp'
 
 DATA_CORRUPT_FOLDER = '.corrupted'
 
+DATA_JOURNAL_FOLDER = '.journal'
+
 DATA_SAVED_FOLDER = 'Saved'
 
+DATA_CATALOG_NAME = '.catalog'
+
 PICKLE_PROTOCOL = min(pickle.HIGHEST_PROTOCOL, 2)
 
+_JOURNAL_HEADER = struct.Struct('<I')
+
+_CATALOG_LOCK = threading.Lock()
+
+#Start uncompressed maps on a multiple of this many bytes, to match the numpy header alignment
+MAP_ALIGNMENT = 64
+
 LOCK_FILE = '{}/mousetrack-{}.lock'.format(TEMPORARY_PATH, format_name(DATA_FOLDER, '-_'))   #Temporary folder
 #LOCK_FILE = '{}/mousetrack-{}.lock'.format(DATA_FOLDER, 1)   #Data folder (for testing)
 
@@ -84,14 +98,53 @@ def _get_paths(program_name):
     temp_name = '{}/{}'.format(temp_folder, name)
     corrupted_folder = '{}/{}'.format(DATA_FOLDER, DATA_CORRUPT_FOLDER)
     corrupted_name = '{}/{}'.format(corrupted_folder, name)
+    journal_folder = '{}/{}'.format(DATA_FOLDER, DATA_JOURNAL_FOLDER)
+    journal_name = '{}/{}'.format(journal_folder, name)
     
-    return {'Main': new_name, 'Backup': backup_name, 'Temp': temp_name, 'Corrupted': corrupted_name,
-            'BackupFolder': backup_folder, 'TempFolder': temp_folder, 'CorruptedFolder': corrupted_folder}
+    return {'Main': new_name, 'Backup': backup_name, 'Temp': temp_name, 'Corrupted': corrupted_name, 'Journal': journal_name,
+            'BackupFolder': backup_folder, 'TempFolder': temp_folder, 'CorruptedFolder': corrupted_folder, 'JournalFolder': journal_folder}
 
 
-def prepare_file(data, legacy=False):
-    """Prepare data for saving."""
-    data['Time']['Modified'] = time.time()
+def _write_data(f, data):
+    """Write everything except the maps to a zip file.
+    The maps in data['Resolution'] must already be separated.
+    """
+    f.write(pickle.dumps(dict(data), PICKLE_PROTOCOL), 'data.pkl',
+            codec=CONFIG['Save']['DataCompression'], level=CONFIG['Save']['DataCompressionLevel'])
+    
+    #Write metadata for quick access
+    f.write(str(VERSION), 'metadata\\version.txt')
+    f.write(str(FILE_VERSION), 'metadata\\file.txt')
+    f.write(str(data['Time']['Modified']), 'metadata/modified.txt')
+    f.write(str(data['Time']['Created']), 'metadata/created.txt')
+    f.write(str(data['TimesLoaded']), 'metadata/sessions.txt')
+    f.write(str(data['Ticks']['Total']), 'metadata/time.txt')
+
+
+def _write_map(f, index, array):
+    """Write a single map to a zip file.
+    Uncompressed maps are aligned so they can be memory mapped.
+    """
+    filename = 'maps/{}.npy'.format(index)
+    codec = CONFIG['Save']['MapCompression']
+    level = CONFIG['Save']['MapCompressionLevel']
+    
+    #Copy the map from the file if not edited
+    if isinstance(array, numpy.LazyLoader) and array.modified:
+        array = array.pop()
+    if isinstance(array, numpy.LazyLoader):
+        array.copy_to(f, filename, codec=codec, level=level, align=MAP_ALIGNMENT)
+    else:
+        f.write(numpy.save(numpy.compact(array)), filename, codec=codec, level=level, align=MAP_ALIGNMENT)
+
+
+def prepare_file(data, legacy=False, _update_modified=True):
+    """Prepare data for saving.
+    Set _update_modified to False to keep the modified time, such as if the file is only being upgraded.
+    """
+    if _update_modified:
+        data['Time']['Modified'] = time.time()
+    data['Time']['Checkpoint'] = time.time()
     data['FileVersion'] = FILE_VERSION
     data['Version'] = VERSION
     
@@ -104,24 +157,9 @@ def prepare_file(data, legacy=False):
     #Write the maps to a zip file in memory
     io = BytesIO()
     with CustomOpen(io, 'w') as f:
-        f.write(pickle.dumps(dict(data), PICKLE_PROTOCOL), 'data.pkl')
-        
-        #Write metadata for quick access
-        f.write(str(VERSION), 'metadata\\version.txt')
-        f.write(str(FILE_VERSION), 'metadata\\file.txt')
-        f.write(str(data['Time']['Modified']), 'metadata/modified.txt')
-        f.write(str(data['Time']['Created']), 'metadata/created.txt')
-        f.write(str(data['TimesLoaded']), 'metadata/sessions.txt')
-        f.write(str(data['Ticks']['Total']), 'metadata/time.txt')
-        
-        #Pickle the numpy map, or load it raw if not edited
+        _write_data(f, data)
         for i, m in enumerate(numpy_maps):
-            if isinstance(m, numpy.LazyLoader) and m.is_loaded:
-                m = m.pop()
-            if isinstance(m, numpy.LazyLoader):
-                f.write(m.pop(raw=True), 'maps/{}.npy'.format(i))
-            else:
-                f.write(numpy.save(m), 'maps/{}.npy'.format(i))
+            _write_map(f, i, m)
     
     #Undo the modify
     IterateMaps(data['Resolution']).join(numpy_maps)
@@ -129,7 +167,33 @@ def prepare_file(data, legacy=False):
     return io.getvalue()
     
 
-def decode_file(f, legacy=False, lazy_load_path=None):
+def snapshot_data(data):
+    """Copy the data so that it can be saved while tracking continues.
+    Loaded maps are copied, and any others will be read from the file when saving.
+    """
+    numpy_maps = IterateMaps(data['Resolution']).separate()
+    try:
+        snapshot = pickle.loads(pickle.dumps(dict(data), PICKLE_PROTOCOL))
+    finally:
+        IterateMaps(data['Resolution']).join(numpy_maps)
+    IterateMaps(snapshot['Resolution']).join([numpy.copy(m) for m in numpy_maps])
+    return snapshot
+    
+
+def mark_saved(snapshot):
+    """Mark the maps in the original data as saved, after a snapshot has been saved.
+    Any maps that have not been edited since will be copied from the file on the next save.
+    """
+    numpy_maps = IterateMaps(snapshot['Resolution']).separate()
+    try:
+        for m in numpy_maps:
+            if isinstance(m, numpy.LazyLoader):
+                m.saved()
+    finally:
+        IterateMaps(snapshot['Resolution']).join(numpy_maps)
+    
+
+def decode_file(f, legacy=False, lazy_load_path=None, tile_size=0, mmap=False):
     """Read compressed data."""
     #Old file format
     if legacy:
@@ -157,14 +221,16 @@ def decode_file(f, legacy=False, lazy_load_path=None):
     try:
         IterateMaps(data['Maps']).join(numpy_maps, _legacy=True)
     except KeyError:
-        IterateMaps(data['Resolution']).join(numpy_maps, _legacy=False, _lazy_load_path=lazy_load_path)
+        IterateMaps(data['Resolution']).join(numpy_maps, _legacy=False, _lazy_load_path=lazy_load_path, _tile_size=tile_size, _mmap=mmap)
         
     return data
     
 
-def load_data(profile_name=None, _reset_sessions=True, _update_metadata=True, _create_new=True, _metadata_only=False):
+def load_data(profile_name=None, _reset_sessions=True, _update_metadata=True, _create_new=True, _metadata_only=False, _tile_size=0, _mmap=False,
+              _maps=None, _resolutions=None):
     """Read a profile (or create new one) and run it through the update.
     Use LoadData class instead of this.
+    See select_maps for how _maps and _resolutions are used.
     """
     paths = _get_paths(profile_name)
     new_file = False
@@ -191,13 +257,13 @@ def load_data(profile_name=None, _reset_sessions=True, _update_metadata=True, _c
     #Load the main file
     try:
         with CustomOpen(paths['Main'], 'rb') as f:
-            loaded_data = decode_file(f, legacy=f.zip is None, lazy_load_path=paths['Main'])
+            loaded_data = decode_file(f, legacy=f.zip is None, lazy_load_path=paths['Main'], tile_size=_tile_size, mmap=_mmap)
             
     #Load backup if file is corrupted
     except (zlib.error, ValueError, zipfile.BadZipfile):
         try:
             with CustomOpen(paths['Backup'], 'rb') as f:
-                loaded_data = decode_file(f, legacy=f.zip is None, lazy_load_path=paths['Main'])
+                loaded_data = decode_file(f, legacy=f.zip is None, lazy_load_path=paths['Main'], tile_size=_tile_size, mmap=_mmap)
                 
         except (IOError, zlib.error, ValueError):
             new_file = True
@@ -218,28 +284,244 @@ def load_data(profile_name=None, _reset_sessions=True, _update_metadata=True, _c
         else:
             return None
     
-    return upgrade_version(loaded_data, reset_sessions=_reset_sessions, update_metadata=_update_metadata)
+    #Apply any changes saved since the file was written
+    #Unused maps are removed first so the journal doesn't load them
+    else:
+        if loaded_data.get('FileVersion') == FILE_VERSION:
+            select_maps(loaded_data, _maps, _resolutions)
+        loaded_data = replay_journal(loaded_data, paths['Journal'])
+    
+    loaded_data = upgrade_version(loaded_data, reset_sessions=_reset_sessions, update_metadata=_update_metadata)
+    return select_maps(loaded_data, _maps, _resolutions)
+
+
+def select_maps(data, maps=None, resolutions=None):
+    """Remove any maps that aren't needed, so they will never be loaded.
+    maps is a list of map names such as 'Tracks' or 'Clicks.Single', and
+    resolutions is a list of (width, height) values to keep.
+    Leave either as None to keep everything.
+    """
+    if maps is None and resolutions is None:
+        return data
+    if maps is not None:
+        maps = [tuple(name.split('.')) if isinstance(name, (str, unicode)) else tuple(name) for name in maps]
+    
+    for resolution in list(data['Resolution']):
+        if resolutions is not None and resolution not in resolutions:
+            del data['Resolution'][resolution]
+        elif maps is not None:
+            data['Resolution'][resolution] = _select_keys(data['Resolution'][resolution], maps)
+    return data
+
+
+def _select_keys(data, keys):
+    """Copy certain keys from a nested dictionary."""
+    selected = {}
+    for key_path in keys:
+        source = data
+        target = selected
+        try:
+            for key in key_path[:-1]:
+                source = source[key]
+                target = target.setdefault(key, {})
+            target[key_path[-1]] = source[key_path[-1]]
+        except KeyError:
+            pass
+    return selected
+
+
+def _read_journal(path):
+    """Read each entry from a journal file.
+    Stops at the first incomplete entry, as the program may have been closed while writing.
+    """
+    try:
+        with open(path, 'rb') as f:
+            while True:
+                header = f.read(_JOURNAL_HEADER.size)
+                if len(header) < _JOURNAL_HEADER.size:
+                    return
+                entry = f.read(_JOURNAL_HEADER.unpack(header)[0])
+                try:
+                    yield pickle.loads(zlib.decompress(entry))
+                except (zlib.error, ValueError, EOFError, pickle.UnpicklingError):
+                    return
+    except IOError:
+        return
+
+
+def replay_journal(data, path):
+    """Apply the journal entries that were written after the loaded file."""
+    try:
+        checkpoint = data['Time']['Checkpoint']
+    except KeyError:
+        return data
+    
+    replayed = None
+    for entry in _read_journal(path):
+        if entry['Checkpoint'] != checkpoint:
+            continue
+            
+        #Replace everything except the maps
+        replayed = entry['Data']
+        replayed['Resolution'] = data['Resolution']
+        
+        #Skip any maps that weren't selected when loading
+        for resolution, keys, indices, values in entry['Maps']:
+            try:
+                maps = replayed['Resolution'][resolution]
+                for key in keys[:-1]:
+                    maps = maps[key]
+                array = maps[keys[-1]]
+            except KeyError:
+                continue
+            maps[keys[-1]] = numpy.assign(array, numpy.unravel_index(indices, resolution[::-1]), values)
+    
+    if replayed is None:
+        return data
+    return replayed
+
+
+def append_journal(profile_name, data, changes, checkpoint):
+    """Write the changes since the last save to the end of the journal.
+    The changes must be a dictionary of {(resolution, map keys): flat indices},
+    and the checkpoint must match the time the main file was saved.
+    
+    Returns True if the changes were written.
+    """
+    paths = _get_paths(profile_name)
+    
+    data['Time']['Modified'] = time.time()
+    data['FileVersion'] = FILE_VERSION
+    data['Version'] = VERSION
+    
+    maps = []
+    for (resolution, keys), indices in iteritems(changes):
+        array = data['Resolution'][resolution]
+        for key in keys:
+            array = array[key]
+        maps.append((resolution, keys, indices, array[numpy.unravel_index(indices, resolution[::-1])]))
+    
+    entry = {'Checkpoint': checkpoint,
+             'Data': {k: v for k, v in iteritems(data) if k != 'Resolution'},
+             'Maps': maps}
+    entry = zlib.compress(pickle.dumps(entry, PICKLE_PROTOCOL))
+    
+    if create_folder(paths['JournalFolder'], is_file=False):
+        hide_file(paths['JournalFolder'])
+    try:
+        with open(paths['Journal'], 'ab') as f:
+            f.write(_JOURNAL_HEADER.pack(len(entry)) + entry)
+    except IOError:
+        return False
+    return True
 
 
 def get_metadata(profile):
+    """Get the metadata of a profile, or None if it doesn't exist.
+    This is read from the catalog if the file hasn't changed.
+    """
+    name = _get_catalog_name(profile)
+    return update_catalog([name]).get(name)
+
+
+def _read_metadata(profile):
     try:
         return load_data(profile, _metadata_only=True)
     except IOError:
         return None
 
+
+def _file_signature(path):
+    """Get the size and modified time of a file, or None if it doesn't exist."""
+    try:
+        return (get_file_size(path), get_modified_time(path))
+    except OSError:
+        return None
+
+
+def _get_catalog_name(profile):
+    """Get the name a profile is stored as in the catalog."""
+    return get_data_filename(profile)[:-len(DATA_EXTENSION)]
+
+
+def update_catalog(profiles, rebuild=False, remove_missing=False):
+    """Get the metadata for a list of profiles from the catalog.
+    The catalog stores the size and modified time of each file,
+    and any that have changed since will be read again.
+    
+    Set rebuild to ignore the current catalog and read every profile,
+    or remove_missing to remove any other profiles from the catalog.
+    """
+    path = '{}/{}'.format(DATA_FOLDER, DATA_CATALOG_NAME)
+    with _CATALOG_LOCK:
+        catalog = {}
+        if not rebuild:
+            try:
+                with open(path, 'rb') as f:
+                    catalog = pickle.load(f)
+            except (IOError, OSError, EOFError, ValueError, TypeError, pickle.UnpicklingError):
+                pass
+        
+        output = {}
+        changed = rebuild
+        for profile in profiles:
+            signature = _file_signature(_get_paths(profile)['Main'])
+            try:
+                cached_signature, metadata = catalog[profile]
+            except KeyError:
+                cached_signature = None
+            
+            if signature is None:
+                changed |= catalog.pop(profile, None) is not None
+                continue
+            if signature != cached_signature:
+                metadata = _read_metadata(profile)
+                catalog[profile] = (signature, metadata)
+                changed = True
+            output[profile] = metadata
+        
+        if remove_missing:
+            for profile in set(catalog) - set(output):
+                del catalog[profile]
+                changed = True
+        
+        #Write to a temporary file first, so a failed write can't corrupt the catalog
+        if changed:
+            temp_path = '{}.{}.tmp'.format(path, os.getpid())
+            try:
+                with open(temp_path, 'wb') as f:
+                    pickle.dump(catalog, f, PICKLE_PROTOCOL)
+            except (IOError, OSError):
+                remove_file(temp_path)
+            else:
+                if not rename_file(temp_path, path):
+                    remove_file(path)
+                    if not rename_file(temp_path, path):
+                        remove_file(temp_path)
+        
+    return output
+
     
 class LoadData(dict):
-    """Wrapper for the load_data function to allow for custom functions."""
-    def __init__(self, profile_name=None, empty=False, _reset_sessions=True, _update_metadata=True):
+    """Wrapper for the load_data function to allow for custom functions.
+    
+    Set _maps or _resolutions to only load some of the maps, such as
+    _maps=['Clicks.Single'], or _maps=[] to only load the keyboard data.
+    The profile can't be saved if this is done.
+    """
+    def __init__(self, profile_name=None, empty=False, _reset_sessions=True, _update_metadata=True, _tile_size=0, _mmap=False,
+                 _maps=None, _resolutions=None):
         if empty:
             data = upgrade_version()
         else:
-            data = load_data(profile_name=profile_name, _reset_sessions=_reset_sessions, _update_metadata=_update_metadata, _create_new=True)
+            data = load_data(profile_name=profile_name, _reset_sessions=_reset_sessions, _update_metadata=_update_metadata, _create_new=True, _tile_size=_tile_size, _mmap=_mmap,
+                             _maps=_maps, _resolutions=_resolutions)
                          
         super(self.__class__, self).__init__(data)
         
         self.version = self['Version']
         self.name = profile_name
+        self.partial = not empty and (_maps is not None or _resolutions is not None)
     
     def _get_track_map(self, track_type, session=False):
         """Return dictionary of tracks along with top resolution and range of values.
@@ -254,7 +536,7 @@ class LoadData(dict):
         max_value = -float('inf')
         result = {}
         for resolution, maps in iteritems(self['Resolution']):
-            array = numpy.max(maps[track_type] - start_time, 0)
+            array = numpy.max(numpy.set_type(maps[track_type], 'int64') - start_time, 0)
             num_records = numpy.count(array)
             if num_records:
                 result[resolution] = array
@@ -339,6 +621,9 @@ def save_data(profile_name, data, _compress=True):
     Instead of overwriting, it will save as a temprary file and attempt to rename.
     At any point in time there are two copies of the save.
     """
+    if getattr(data, 'partial', False):
+        raise ValueError('only some of the maps were loaded, so the profile can\'t be saved')
+    
     #This is to allow pre-compressed data to be sent in
     if _compress:
         data = prepare_file(data)
@@ -352,26 +637,168 @@ def save_data(profile_name, data, _compress=True):
     with open(paths['Temp'], 'wb') as f:
         f.write(data)
     remove_file(paths['Backup'])
-    rename_file(paths['Main'], paths['Backup'])
-    if rename_file(paths['Temp'], paths['Main']):
+    with replacing_file(paths['Main']):
+        rename_file(paths['Main'], paths['Backup'])
+        replaced = rename_file(paths['Temp'], paths['Main'])
+    if replaced:
+        
+        #The journal only applies to the previous file
+        remove_file(paths['Journal'])
+        update_catalog([_get_catalog_name(profile_name)])
         return True
     else:
         remove_file(paths['Temp'])
         return False
 
+
+def unload_data(profile_name=None, data=None):
+    """Close any files kept open to lazy load the maps of a profile.
+    If the data is given, any unedited maps read with mmap are closed too,
+    and they will be read from the file again if needed.
+    """
+    paths = set()
+    if profile_name is not None:
+        paths.add(_get_paths(profile_name)['Main'])
+    if data is not None:
+        for maps in data['Resolution'].values():
+            for _, array in _iterate_map_keys(maps):
+                if isinstance(array, numpy.LazyLoader):
+                    paths.add(array.path)
+                    if array.mmap and not array.modified:
+                        array.clear()
+    for path in paths:
+        close_cached(path)
+
         
-def get_data_files():
+def get_data_files(rebuild=False):
     """Get the name and metadata of every saved profile in the data folder.
     Some of the metadata may not exist in older files.
+    The metadata is read from the catalog, unless the file has changed.
     """
     all_files = list_directory(DATA_FOLDER, force_extension=DATA_EXTENSION, remove_extensions=True)
     if all_files is None:
         return []
-    output = {}
-    for f in all_files:
-        metadata = get_metadata(f)
-        output[f.replace(DATA_EXTENSION, '')] = metadata
-    return output
+    metadata = update_catalog(all_files, rebuild=rebuild, remove_missing=True)
+    return {f: metadata.get(f) for f in all_files}
+
+
+def _add_values(total, values):
+    """Recursively add the numbers from one dictionary to another."""
+    for key, value in iteritems(values):
+        if isinstance(value, dict):
+            _add_values(total.setdefault(key, {}), value)
+        else:
+            total[key] = total.get(key, 0) + value
+    return total
+
+
+def _iterate_map_keys(maps, keys=()):
+    """Get the key path to every map in a resolution."""
+    for key, value in iteritems(maps):
+        if isinstance(value, dict):
+            for result in _iterate_map_keys(value, keys + (key,)):
+                yield result
+        else:
+            yield keys + (key,), value
+
+
+def _merge_map(merged, array, map_type, scale):
+    """Combine a single map with the merged map so far.
+    Tracks store the tick they were last updated, so are scaled first.
+    """
+    if map_type in ('Tracks', 'StrokesSeparate'):
+        if scale != 1:
+            array = numpy.round(numpy.multiply(array, scale), dtype='uint32')
+        merge_type = 'max'
+    elif map_type in ('Speed', 'Strokes'):
+        merge_type = 'max'
+    else:
+        merge_type = 'add'
+    
+    if merged is None:
+        return numpy.set_type(array, 'int64')
+    return numpy.merge([merged, array], merge_type, dtype='int64')
+
+
+def _remove_temporary_file(path):
+    """Close and delete a file that was only needed while running."""
+    close_cached(path)
+    remove_file(path)
+
+
+def merge_profiles(profile_names, path=None, name=None):
+    """Merge multiple profiles into one, which can be saved or rendered.
+    
+    Clicks and keys are added together, the tracks from each profile are
+    scaled to the same number of ticks before taking the maximum, and the
+    speed uses the maximum. The animation history is left empty.
+    
+    Only one map from the source profiles is loaded at a time, as each
+    merged map is written straight to path, then lazy loaded from there.
+    If no path is given, a temporary file is used and deleted on exit.
+    """
+    missing = [profile_name for profile_name in profile_names if not file_exists(_get_paths(profile_name)['Main'])]
+    if missing:
+        raise ValueError('profile doesn\'t exist: {}'.format(', '.join(missing)))
+    
+    if path is None:
+        handle, path = mkstemp(suffix=DATA_EXTENSION)
+        os.close(handle)
+        atexit.register(_remove_temporary_file, path)
+    
+    profiles = [LoadData(profile_name, _reset_sessions=False, _update_metadata=False) for profile_name in profile_names]
+    
+    #Combine everything except the maps
+    data = LoadData(empty=True)
+    data['Sessions'] = []
+    data['TimesLoaded'] = 0
+    for profile in profiles:
+        for key in ('Keys', 'Gamepad', 'Distance', 'Ticks'):
+            _add_values(data[key], profile[key])
+        data['TimesLoaded'] += profile['TimesLoaded']
+        data['Sessions'] += profile['Sessions']
+        data['Time']['Created'] = min(data['Time']['Created'], profile['Time']['Created'])
+        for version, upgraded in iteritems(profile['VersionHistory']):
+            data['VersionHistory'][version] = min(data['VersionHistory'].get(version, upgraded), upgraded)
+    data['Sessions'].sort()
+    data['Ticks']['Tracks'] = data['Ticks']['Session']['Tracks'] = max([0] + [profile['Ticks']['Tracks'] for profile in profiles])
+    
+    #Find which profiles contain each map
+    sources = {}
+    for profile in profiles:
+        scale = data['Ticks']['Tracks'] / float(profile['Ticks']['Tracks']) if profile['Ticks']['Tracks'] else 1
+        for resolution, maps in iteritems(profile['Resolution']):
+            for keys, array in _iterate_map_keys(maps):
+                sources.setdefault((resolution, keys), []).append((array, scale))
+    
+    #Merge one map at a time and write it to the file
+    data['Time']['Modified'] = data['Time']['Checkpoint'] = time.time()
+    data['FileVersion'] = FILE_VERSION
+    data['Version'] = VERSION
+    data['Resolution'] = {}
+    with CustomOpen(path, 'w') as f:
+        for i, ((resolution, keys), arrays) in enumerate(sorted(sources.items())):
+            merged = None
+            for array, scale in arrays:
+                if isinstance(array, numpy.LazyLoader):
+                    array = array.pop()
+                merged = _merge_map(merged, array, keys[0], scale)
+            _write_map(f, i, merged)
+            del merged
+            
+            maps = data['Resolution'].setdefault(resolution, {})
+            for key in keys[:-1]:
+                maps = maps.setdefault(key, {})
+            maps[keys[-1]] = i
+        _write_data(f, data)
+    
+    for profile_name in profile_names:
+        unload_data(profile_name)
+    
+    with CustomOpen(path, 'rb') as f:
+        data.update(decode_file(f, lazy_load_path=path))
+    data.name = name if name is not None else ' + '.join(profile_names)
+    return data
 
        
 class Lock(object):
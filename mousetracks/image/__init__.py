@@ -12,7 +12,7 @@ import sys
 import time
 
 from .colours import get_map_matches, calculate_colour_map
-from .main import RenderImage
+from .main import RenderImage, render_images, RENDER_MAPS
 from ..applications import RunningApplications, AppList
 from ..constants import DEFAULT_NAME, UPDATES_PER_SECOND
 from ..config.settings import CONFIG
@@ -247,8 +247,9 @@ def _user_generate():
         Message(LANGUAGE.strings['Misc']['ProgramExit'])
         return
 
+    #Only load the keyboard data until the type of render is known
     Message(LANGUAGE.strings['Misc']['ProfileLoad'].format_custom(PROFILE=profile))
-    render = RenderImage(profile)
+    render = RenderImage(profile, maps=())
 
     #Ask for type of render
     render_types = [
@@ -268,6 +269,7 @@ def _user_generate():
     Message()
     Message(LANGUAGE.strings['GenerationInput']['GenerateChoice'])
     if not any(select_options(render_types, multiple_choice=True)):
+        render.close()
         if yes_or_no(LANGUAGE.strings['GenerationInput']['NoSelection']):
             return True
         return False
@@ -437,31 +439,29 @@ def _user_generate():
                 break
     
     #Render the images
-    if render_types[0][1]:
-        for colour_map in render_types[0][3]:
-            CONFIG['GenerateTracks']['ColourProfile'] = colour_map
-            render.tracks(session)
-            Message()
-    if render_types[1][1]:
-        for colour_map in render_types[1][3]:
-            CONFIG['GenerateHeatmap']['ColourProfile'] = colour_map
-            render.clicks(session)
-            Message()
-    if render_types[2][1]:
-        for colour_map in render_types[2][3]:
-            CONFIG['GenerateKeyboard']['ColourProfile'] = colour_map
-            render.keyboard(session)
-            Message()
-    if render_types[3][1]:
-        for colour_map in render_types[3][3]:
-            CONFIG['GenerateSpeed']['ColourProfile'] = colour_map
-            render.speed(session)
-            Message()
-    if render_types[4][1]:
-        for colour_map in render_types[4][3]:
-            CONFIG['GenerateStrokes']['ColourProfile'] = colour_map
-            render.strokes(session)
-            Message()
+    render_settings = [('tracks', 'GenerateTracks'),
+                       ('clicks', 'GenerateHeatmap'),
+                       ('keyboard', 'GenerateKeyboard'),
+                       ('speed', 'GenerateSpeed'),
+                       ('strokes', 'GenerateStrokes')]
+    mouse_buttons = {mb_id: bool(CONFIG['GenerateHeatmap'][mb_id]) for mb_id in ('_MouseButtonLeft', '_MouseButtonMiddle', '_MouseButtonRight')}
+    jobs = []
+    for (render_type, config_heading), (name, enabled, _, colour_maps) in zip(render_settings, render_types):
+        if not enabled:
+            continue
+        for colour_map in map(str, colour_maps):
+            config = {config_heading: {'ColourProfile': colour_map}}
+            if render_type == 'clicks':
+                config[config_heading].update(mouse_buttons)
+            jobs.append(('{} ({})'.format(name, colour_map), render_type, config))
+    
+    #Load the maps needed for the selected renders
+    maps = sorted(set(map_name for _, render_type, _ in jobs for map_name in RENDER_MAPS[render_type]))
+    if maps:
+        render.close()
+        render = RenderImage(profile, maps=maps)
+    render_images(render, jobs, session)
+    render.close()
         
     #Open folder
     if CONFIG['GenerateImages']['OpenOnFinish']:
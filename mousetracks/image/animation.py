@@ -6,10 +6,9 @@ Source: https://github.com/Peter92/MouseTracks
 from __future__ import division
 
 from .main import RenderImage
-from ..utils.compatibility import range
+from ..utils import numpy
 from ..files import LoadData
-from ..utils.maths import calculate_line
-from ..track.background import check_resolution, monitor_offset
+from ..track.background import check_resolution, split_by_monitor
 
 
 class TrackHistory(object):
@@ -21,20 +20,12 @@ class TrackHistory(object):
         Ask for colour profile
         Auto select output resolution (since it can change)
     """
-    _CACHE = {'Steps': {}}
     def __init__(self, data):
         self.data = data
         self._track_history = [tuple(i) for i in self.data['HistoryAnimation']['Tracks']]
         self._counts = [len(i)-1 for i in self.data['HistoryAnimation']['Tracks']]
         self._total = sum(self._counts)
         self.reset()
-    
-    def _step_range(self, steps):
-        try:
-            return self._CACHE['Steps'][steps]
-        except KeyError:
-            self._CACHE['Steps'][steps] = list(range(steps))
-            return self._CACHE['Steps'][steps]
 
     def _next_resolution(self):
         try:
@@ -51,39 +42,45 @@ class TrackHistory(object):
         self._resolution['Current'] = new_resolution
         return True
 
-    def _step(self):
-        """Step forward a single frame."""
-        coordinate = self._track_history[self._index][self._current + 1]
+    def _step(self, steps=1):
+        """Step forward multiple frames within the current resolution."""
+        coordinates = self._track_history[self._index][self._current+1:self._current+1+steps]
+        if not coordinates:
+            return
 
-        #Calculate line between points
+        #Calculate the lines between every point at once
+        #Each pixel gets the count of the frame it was drawn on
         if self._last_pos is None:
-            mouse_coordinates = [coordinate]
+            xs, ys, index = numpy.calculate_lines(coordinates, return_index=True)
+            counts = index + self._count
         else:
-            mouse_coordinates = [self._last_pos] + calculate_line(self._last_pos, coordinate) + [coordinate]
-        self._last_pos = coordinate
+            xs, ys, index = numpy.calculate_lines((self._last_pos,) + coordinates, return_index=True)
+            counts = index + (self._count - 1)
+        self._last_pos = coordinates[-1]
 
-        #Add to data
-        for (x, y) in mouse_coordinates:
-            
-            try:
-                try:
-                    resolution, (x_offset, y_offset) = monitor_offset((x, y), self._resolution['Current'])
-                except ValueError:
-                    #TODO: Application resolution requires [var[0]], the other types don't, need to edit all of stored history to fix
-                    resolution, (x_offset, y_offset) = monitor_offset((x, y), [self._resolution['Current'][0]])
-            
-            #Mouse outside bounds
-            except TypeError:
-                continue
+        #Find which monitor each pixel is on
+        try:
+            groups = split_by_monitor(xs, ys, self._resolution['Current'])[0]
+        except ValueError:
+            #TODO: Application resolution requires [var[0]], the other types don't, need to edit all of stored history to fix
+            groups = split_by_monitor(xs, ys, [self._resolution['Current'][0]])[0]
+        
+        #Mouse outside bounds
+        except TypeError:
+            groups = []
 
+        #Add to data
+        for resolution, (x, y), indexes in groups:
             if resolution not in self._resolution['All']:
                 self._resolution['All'].add(resolution)
                 check_resolution(self._data, resolution)
-                
-            self._data['Resolution'][resolution]['Tracks'][y-y_offset][x-x_offset] = self._count
+            
+            #Later frames have higher counts, so this keeps the most recent one
+            maps = self._data['Resolution'][resolution]
+            maps['Tracks'] = numpy.maximum_at(maps['Tracks'], (y, x), counts[indexes])
         
-        self._current += 1
-        self._count += 1
+        self._current += len(coordinates)
+        self._count += len(coordinates)
 
     def step(self, steps, render_file=False):
         """Step forward any number of steps.
@@ -94,14 +91,12 @@ class TrackHistory(object):
 
         #All steps are within the current resolution
         if distance_to_resolution > steps:
-            for step in self._step_range(steps):
-                self._step()
+            self._step(steps)
         
         #Resolution changes at some point
         else:
             steps, remaining_steps = distance_to_resolution, steps - distance_to_resolution
-            for step in self._step_range(steps):
-                self._step()
+            self._step(steps)
             if self._next_resolution():
                 self.step(remaining_steps)
         
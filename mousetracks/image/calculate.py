@@ -125,15 +125,40 @@ def upscale_arrays_to_resolution(arrays, target_resolution, skip=[]):
     return output
 
 
+def upscale_and_add_arrays(arrays, target_resolution, skip=[]):
+    """Upscale a dict of arrays to a certain resolution and add them together.
+    This gives the same result as upscale_arrays_to_resolution followed by
+    a merge, but only the nonzero values are upscaled, which is much
+    quicker for sparse arrays such as clicks.
+    """
+    if isinstance(skip, int):
+        skip = [skip]
+    skip = set(skip)
+
+    array_list = []
+    for resolution, arrays_at_resolution in iteritems(arrays):
+        if not isinstance(arrays_at_resolution, (list, tuple)):
+            arrays_at_resolution = [arrays_at_resolution]
+        array_list += [array for i, array in enumerate(arrays_at_resolution) if i not in skip]
+
+    Message(LANGUAGE.strings['Generation']['UpscaleArrayStart'].format_custom(XRES=target_resolution[0], YRES=target_resolution[1]))
+    return numpy.upscale_add(array_list, target_resolution)
+
+
 def arrays_to_heatmap(numpy_arrays, gaussian_size, clip):
     """Convert list of arrays into a heatmap.
     The stages and values are chosen with trial and error, 
     so this function is still open to improvement.
+
+    An array that has already been merged may be given instead of a list.
     """
     
     #Add all arrays together
-    Message(LANGUAGE.strings['Generation']['ArrayMerge'])
-    merged_arrays = numpy.merge(numpy_arrays, 'add', 'float64')
+    if isinstance(numpy_arrays, (list, tuple)):
+        Message(LANGUAGE.strings['Generation']['ArrayMerge'])
+        merged_arrays = numpy.merge(numpy_arrays, 'add', 'float64')
+    else:
+        merged_arrays = numpy_arrays
     
     #Set to constant values
     Message(LANGUAGE.strings['Generation']['ArrayRemap'])
@@ -150,8 +175,7 @@ def arrays_to_heatmap(numpy_arrays, gaussian_size, clip):
     min_value = numpy.min(heatmap)
     
     #Lower the maximum value a little
-    all_values = numpy.sort(heatmap.ravel(), unique=True)
-    max_value = all_values[round_int(all_values.size * clip)]
+    max_value = numpy.quantile_unique(heatmap, clip)
     
     return ((min_value, max_value), heatmap)
 
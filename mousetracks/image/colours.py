@@ -77,6 +77,14 @@ class ColourRange(object):
                 self.cache.append(self.calculate_colour(self.min + i * self._step_size))
         else:
             self.cache = cache
+        self._lut = None
+    
+    @property
+    def lut(self):
+        """Get the cache as a numpy array, to convert whole arrays at once."""
+        if self._lut is None:
+            self._lut = numpy.array(self.cache, dtype='uint8')
+        return self._lut
             
     def __getitem__(self, n):
         """Read an item from the cache."""
@@ -128,16 +136,9 @@ class ColourRange(object):
             array = numpy.array(array)
             Message(message.format(array.size))
         
+        #Any values outside the range use the first or last colour
         new = numpy.round(numpy.divide(array - self.min, self._step_size), 0, 'int64')
-    
-        start_colour = self.cache[0]
-        end_colour = self.cache[-1]
-        colour_array = [[self.cache[item] if 0 <= item <= self.steps 
-                         else start_colour if item < 0 
-                         else end_colour for item in sublst] 
-                        for sublst in new.tolist()]
-                        
-        return numpy.array(colour_array, dtype='uint8')
+        return numpy.take(self.lut, numpy.clip(new, 0, self.steps))
     
     def _preview_gradient(self, width, height):
         """Draw a gradient to test the colours."""
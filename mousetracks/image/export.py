@@ -9,15 +9,18 @@ from __future__ import absolute_import
 from ..utils import numpy
 from ..utils.compatibility import range, iteritems, Message
 from ..config.settings import CONFIG
-from ..files import load_data
+from ..files import LoadData
 from ..config.language import LANGUAGE
 from ..utils.os import create_folder
 
 
 class ExportCSV(object):
-    def __init__(self, profile, data=None):
+    def __init__(self, profile, data=None, maps=None):
+        """Use the loaded data if given, otherwise load the profile.
+        Set maps to only load certain maps, such as ['Tracks'].
+        """
         if data is None:
-            data = load_data(profile, _update_version=False)
+            data = LoadData(profile, _update_metadata=False, _mmap=True, _maps=maps)
         self.profile = profile
         self.data = data
     
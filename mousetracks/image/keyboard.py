@@ -12,7 +12,7 @@ from .misc import save_image_to_folder
 from ..utils.compatibility import PYTHON_VERSION, Message, range, bytes
 from ..config.settings import CONFIG
 from ..config.language import LANGUAGE
-from ..files import load_data
+from ..files import LoadData
 from ..utils.maths import round_int, calculate_circle
 from ..messages import ticks_to_seconds
 
@@ -381,7 +381,7 @@ class DrawKeyboard(object):
     
     def reload(self, data=None):
         if data is None:
-            data = load_data(self.name)
+            data = LoadData(self.name, _maps=())
         if self.last_session:
             self.key_counts = data['Keys']['Session']
             self.ticks = data['Ticks']['Total'] - data['Ticks']['Session']['Total']
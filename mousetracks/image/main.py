@@ -6,18 +6,22 @@ Source: https://github.com/Peter92/MouseTracks
 from __future__ import absolute_import, division
 
 from PIL import Image
+import sys
 import zlib
+from functools import partial
+from multiprocessing import Pool, Queue, cpu_count
+from threading import Thread
 
 from .export import ExportCSV
 from .misc import save_image_to_folder
-from .calculate import arrays_to_heatmap, arrays_to_colour, gaussian_size, calculate_resolution, upscale_arrays_to_resolution
+from .calculate import arrays_to_heatmap, arrays_to_colour, gaussian_size, calculate_resolution, upscale_arrays_to_resolution, upscale_and_add_arrays
 from .colours import ColourRange, calculate_colour_map
 from .keyboard import DrawKeyboard
 from ..config.language import LANGUAGE
 from ..config.settings import CONFIG
-from ..misc import format_file_path
+from ..misc import close_cached, format_file_path
 from ..constants import UPDATES_PER_SECOND, DEFAULT_NAME
-from ..files import LoadData, format_name
+from ..files import LoadData, format_name, unload_data
 from ..utils.compatibility import Message, pickle, iteritems
 from ..utils.maths import round_int
 from ..utils.os import remove_file, join_path
@@ -236,23 +240,36 @@ class ImageName(object):
         return '{}.{}'.format(name, ext)
 
 
+#The maps needed by each type of render, so the other maps are never loaded
+RENDER_MAPS = {'tracks': ('Tracks',),
+               'speed': ('Speed',),
+               'strokes': ('Strokes',),
+               'clicks': ('Clicks.Single',),
+               'double_clicks': ('Clicks.Double',),
+               'keyboard': ()}
+
+
 class RenderImage(object):
     
-    def __init__(self, profile=None, allow_save=True):
-    
+    def __init__(self, profile=None, allow_save=True, maps=None):
+        """Set maps to only load certain maps, such as ['Clicks']."""
         if isinstance(profile, LoadData):
             self.profile = profile.name
             self.data = profile
         else:
             self.profile = profile
         
-            self.data = LoadData(profile, _update_metadata=False)
+            self.data = LoadData(profile, _update_metadata=False, _mmap=True, _maps=maps)
             if self.data is None:
                 raise ValueError('profile doesn\'t exist')
             
         self.name = ImageName(self.profile, data=self.data)
         self.save = allow_save
 
+    def close(self):
+        """Close the profile file, so it can be replaced while the maps aren't needed."""
+        unload_data(data=self.data)
+
     def keys_per_hour(self, session=False):
         """Detect if the game has keyboard tracking or not.
         This is for if the script is not elevated while running.
@@ -394,9 +411,9 @@ class RenderImage(object):
                 skip.append(1)
             if not rmb:
                 skip.append(2)
-        upscaled_arrays = upscale_arrays_to_resolution(clicks, upscale_resolution, skip=skip)
+        merged_array = upscale_and_add_arrays(clicks, upscale_resolution, skip=skip)
 
-        (min_value, max_value), heatmap = arrays_to_heatmap(upscaled_arrays,
+        (min_value, max_value), heatmap = arrays_to_heatmap(merged_array,
                                gaussian_size=gaussian_size(upscale_resolution[0], upscale_resolution[1]),
                                clip=1-CONFIG['Advanced']['HeatmapRangeClipping'])
 
@@ -421,4 +438,104 @@ class RenderImage(object):
             file_path = self.name.generate('Keyboard', reload=True)
             
         if self.save:
-            save_image_to_folder(image_output, file_path)
\ No newline at end of file
+            save_image_to_folder(image_output, file_path)
+
+
+class _QueueWriter(object):
+    """Replace sys.stdout in a render process to send each line to the main process."""
+    def __init__(self, queue):
+        self.queue = queue
+        self.name = None
+        self._line = ''
+
+    def write(self, text):
+        lines = (self._line + text).split('\n')
+        self._line = lines.pop()
+        for line in lines:
+            self.queue.put((self.name, line))
+
+    def flush(self):
+        pass
+
+
+_WRITER = None
+
+_DATA = None
+
+
+def _init_render_process(queue, data):
+    global _WRITER, _DATA
+    _WRITER = sys.stdout = _QueueWriter(queue)
+    _DATA = data
+
+
+def _render_process(session, job):
+    """Render a single image in a separate process.
+    The loaded profile is sent once to each process, and any maps that
+    are saved are read from the file when needed instead of being sent.
+    """
+    name, render_type, config = job
+    _WRITER.name = name
+    for heading, values in iteritems(config):
+        for variable, value in iteritems(values):
+            CONFIG[heading][variable] = value
+    render = RenderImage(_DATA)
+    try:
+        getattr(render, render_type)(session)
+    finally:
+        render.close()
+
+
+def _print_messages(queue):
+    """Show the messages from each render process until None is received."""
+    while True:
+        item = queue.get()
+        if item is None:
+            return
+        name, line = item
+        if line:
+            Message('[{}] {}'.format(name, line))
+
+
+def render_images(render, jobs, session=False, processes=None):
+    """Render multiple images at once.
+
+    Each job is a tuple of (name, render type, config), where the render
+    type is a RenderImage method, and the config is a dict of settings
+    to change, such as {'GenerateTracks': {'ColourProfile': 'Demon'}}.
+
+    The number of processes defaults to the RenderProcesses setting.
+    If only one is used, the images are rendered one at a time instead.
+    """
+    if processes is None:
+        processes = CONFIG['GenerateImages']['RenderProcesses']
+    if not processes:
+        processes = cpu_count()
+    processes = min(processes, len(jobs))
+
+    if processes <= 1:
+        for name, render_type, config in jobs:
+            for heading, values in iteritems(config):
+                for variable, value in iteritems(values):
+                    CONFIG[heading][variable] = value
+            getattr(render, render_type)(session)
+            Message()
+        return
+
+    queue = Queue()
+    message_thread = Thread(target=_print_messages, args=(queue,))
+    message_thread.daemon = True
+    message_thread.start()
+
+    #Forked processes would share the file position of any open profiles
+    close_cached()
+    pool = Pool(processes, initializer=_init_render_process, initargs=(queue, render.data))
+    try:
+        pool.map(partial(_render_process, session), jobs, chunksize=1)
+    finally:
+        pool.close()
+        pool.join()
+
+        #Wait for the remaining messages once every process has finished
+        queue.put(None)
+        message_thread.join()
@@ -2,25 +2,26 @@
 Source: https://github.com/Peter92/MouseTracks
 """
 #Import the local scipy if possible, otherwise fallback to the installed one
+#This is done on first use, as scipy is slow to import
 
 from __future__ import absolute_import
 
+from ...utils import numpy
 from ...utils.numpy import process_numpy_array
-try:
-    from .gaussian import gaussian_filter
-    from .zoom import zoom
-except ImportError:
-    from scipy.ndimage.filters import gaussian_filter
-    from scipy.ndimage.interpolation import zoom
-    
+
 
 @process_numpy_array
 def blur(array, size):
-    return gaussian_filter(array, sigma=size)
+    """Blur with numpy, as scipy is slow with the large sizes used for heatmaps."""
+    return numpy.gaussian_blur(array, size)
 
 
 @process_numpy_array
 def upscale(array, factor):
     if factor[0] == 1 and factor[1] == 1:
         return array
+    try:
+        from .zoom import zoom
+    except ImportError:
+        from scipy.ndimage.interpolation import zoom
     return zoom(array, factor, order=0)
\ No newline at end of file
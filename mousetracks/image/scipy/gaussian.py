@@ -1,223 +0,0 @@
-# Copyright (C) 2003-2005 Peter J. Verveer
-#
-# Redistribution and use in source and binary forms, with or without
-# modification, are permitted provided that the following conditions
-# are met:
-#
-# 1. Redistributions of source code must retain the above copyright
-#    notice, this list of conditions and the following disclaimer.
-#
-# 2. Redistributions in binary form must reproduce the above
-#    copyright notice, this list of conditions and the following
-#    disclaimer in the documentation and/or other materials provided
-#    with the distribution.
-#
-# 3. The name of the author may not be used to endorse or promote
-#    products derived from this software without specific prior
-#    written permission.
-#
-# THIS SOFTWARE IS PROVIDED BY THE AUTHOR ``AS IS'' AND ANY EXPRESS
-# OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO, THE IMPLIED
-# WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE
-# ARE DISCLAIMED. IN NO EVENT SHALL THE AUTHOR BE LIABLE FOR ANY
-# DIRECT, INDIRECT, INCIDENTAL, SPECIAL, EXEMPLARY, OR CONSEQUENTIAL
-# DAMAGES (INCLUDING, BUT NOT LIMITED TO, PROCUREMENT OF SUBSTITUTE
-# GOODS OR SERVICES; LOSS OF USE, DATA, OR PROFITS; OR BUSINESS
-# INTERRUPTION) HOWEVER CAUSED AND ON ANY THEORY OF LIABILITY,
-# WHETHER IN CONTRACT, STRICT LIABILITY, OR TORT (INCLUDING
-# NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE OF THIS
-# SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
-
-from __future__ import division, absolute_import
-import numpy
-import math
-
-from . import _ni_support
-try:
-    from . import _nd_image
-except ImportError:
-    from scipy.ndimage import _nd_image
-
-
-def correlate1d(input, weights, axis=-1, output=None, mode="reflect",
-                cval=0.0, origin=0):
-    """Calculate a one-dimensional correlation along the given axis.
-
-    The lines of the array along the given axis are correlated with the
-    given weights.
-
-    Parameters
-    ----------
-    %(input)s
-    weights : array
-        One-dimensional sequence of numbers.
-    %(axis)s
-    %(output)s
-    %(mode)s
-    %(cval)s
-    %(origin)s
-    """
-    input = numpy.asarray(input)
-    if numpy.iscomplexobj(input):
-        raise TypeError('Complex type not supported')
-    output, return_value = _ni_support._get_output(output, input)
-    weights = numpy.asarray(weights, dtype=numpy.float64)
-    if weights.ndim != 1 or weights.shape[0] < 1:
-        raise RuntimeError('no filter weights given')
-    if not weights.flags.contiguous:
-        weights = weights.copy()
-    axis = _ni_support._check_axis(axis, input.ndim)
-    if (len(weights) // 2 + origin < 0) or (len(weights) // 2 +
-                                            origin > len(weights)):
-        raise ValueError('invalid origin')
-    mode = _ni_support._extend_mode_to_code(mode)
-    _nd_image.correlate1d(input, weights, axis, output, mode, cval,
-                          origin)
-    return return_value
-
-
-def gaussian_filter1d(input, sigma, axis=-1, order=0, output=None,
-                      mode="reflect", cval=0.0, truncate=4.0):
-    """One-dimensional Gaussian filter.
-
-    Parameters
-    ----------
-    %(input)s
-    sigma : scalar
-        standard deviation for Gaussian kernel
-    %(axis)s
-    order : {0, 1, 2, 3}, optional
-        An order of 0 corresponds to convolution with a Gaussian
-        kernel. An order of 1, 2, or 3 corresponds to convolution with
-        the first, second or third derivatives of a Gaussian. Higher
-        order derivatives are not implemented
-    %(output)s
-    %(mode)s
-    %(cval)s
-    truncate : float, optional
-        Truncate the filter at this many standard deviations.
-        Default is 4.0.
-
-    Returns
-    -------
-    gaussian_filter1d : ndarray
-
-    """
-    if order not in range(4):
-        raise ValueError('Order outside 0..3 not implemented')
-    sd = float(sigma)
-    # make the radius of the filter equal to truncate standard deviations
-    lw = int(truncate * sd + 0.5)
-    weights = [0.0] * (2 * lw + 1)
-    weights[lw] = 1.0
-    sum = 1.0
-    sd = sd * sd
-    # calculate the kernel:
-    for ii in range(1, lw + 1):
-        tmp = math.exp(-0.5 * float(ii * ii) / sd)
-        weights[lw + ii] = tmp
-        weights[lw - ii] = tmp
-        sum += 2.0 * tmp
-    for ii in range(2 * lw + 1):
-        weights[ii] /= sum
-    # implement first, second and third order derivatives:
-    if order == 1:  # first derivative
-        weights[lw] = 0.0
-        for ii in range(1, lw + 1):
-            x = float(ii)
-            tmp = -x / sd * weights[lw + ii]
-            weights[lw + ii] = -tmp
-            weights[lw - ii] = tmp
-    elif order == 2:  # second derivative
-        weights[lw] *= -1.0 / sd
-        for ii in range(1, lw + 1):
-            x = float(ii)
-            tmp = (x * x / sd - 1.0) * weights[lw + ii] / sd
-            weights[lw + ii] = tmp
-            weights[lw - ii] = tmp
-    elif order == 3:  # third derivative
-        weights[lw] = 0.0
-        sd2 = sd * sd
-        for ii in range(1, lw + 1):
-            x = float(ii)
-            tmp = (3.0 - x * x / sd) * x * weights[lw + ii] / sd2
-            weights[lw + ii] = -tmp
-            weights[lw - ii] = tmp
-    return correlate1d(input, weights, axis, output, mode, cval, 0)
-
-
-def gaussian_filter(input, sigma, order=0, output=None,
-                  mode="reflect", cval=0.0, truncate=4.0):
-    """Multidimensional Gaussian filter.
-
-    Parameters
-    ----------
-    %(input)s
-    sigma : scalar or sequence of scalars
-        Standard deviation for Gaussian kernel. The standard
-        deviations of the Gaussian filter are given for each axis as a
-        sequence, or as a single number, in which case it is equal for
-        all axes.
-    order : {0, 1, 2, 3} or sequence from same set, optional
-        The order of the filter along each axis is given as a sequence
-        of integers, or as a single number.  An order of 0 corresponds
-        to convolution with a Gaussian kernel. An order of 1, 2, or 3
-        corresponds to convolution with the first, second or third
-        derivatives of a Gaussian. Higher order derivatives are not
-        implemented
-    %(output)s
-    %(mode)s
-    %(cval)s
-    truncate : float
-        Truncate the filter at this many standard deviations.
-        Default is 4.0.
-
-    Returns
-    -------
-    gaussian_filter : ndarray
-        Returned array of same shape as `input`.
-
-    Notes
-    -----
-    The multidimensional filter is implemented as a sequence of
-    one-dimensional convolution filters. The intermediate arrays are
-    stored in the same data type as the output. Therefore, for output
-    types with a limited precision, the results may be imprecise
-    because intermediate results may be stored with insufficient
-    precision.
-
-    Examples
-    --------
-    >>> from scipy.ndimage import gaussian_filter
-    >>> a = np.arange(50, step=2).reshape((5,5))
-    >>> a
-    array([[ 0,  2,  4,  6,  8],
-           [10, 12, 14, 16, 18],
-           [20, 22, 24, 26, 28],
-           [30, 32, 34, 36, 38],
-           [40, 42, 44, 46, 48]])
-    >>> gaussian_filter(a, sigma=1)
-    array([[ 4,  6,  8,  9, 11],
-           [10, 12, 14, 15, 17],
-           [20, 22, 24, 25, 27],
-           [29, 31, 33, 34, 36],
-           [35, 37, 39, 40, 42]])
-
-    """
-    input = numpy.asarray(input)
-    output, return_value = _ni_support._get_output(output, input)
-    orders = _ni_support._normalize_sequence(order, input.ndim)
-    if not set(orders).issubset(set(range(4))):
-        raise ValueError('Order outside 0..4 not implemented')
-    sigmas = _ni_support._normalize_sequence(sigma, input.ndim)
-    axes = list(range(input.ndim))
-    axes = [(axes[ii], sigmas[ii], orders[ii])
-                        for ii in range(len(axes)) if sigmas[ii] > 1e-15]
-    if len(axes) > 0:
-        for axis, sigma, order in axes:
-            gaussian_filter1d(input, sigma, axis, order, output,
-                              mode, cval, truncate)
-            input = output
-    else:
-        output[...] = input[...]
-    return return_value
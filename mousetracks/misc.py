@@ -7,14 +7,56 @@ from __future__ import absolute_import, division
 
 import codecs
 import os
+import struct
 import sys
+import time
 import zipfile
+from contextlib import contextmanager
 from re import sub
+from threading import Lock, RLock
 
 from .utils.compatibility import PYTHON_VERSION, BytesIO
 from .utils.os import get_documents_path, read_env_var
 
 
+#Extra field used to pad a zip header, the same as used by zipalign
+_ZIP_PADDING = struct.Struct('<HH')
+
+_ZIP_PADDING_ID = 0xD935
+
+#Size of the zip header before each file, and where the name and extra field lengths are stored
+_ZIP_HEADER_SIZE = 30
+
+_ZIP_HEADER_LENGTHS = struct.Struct('<HH')
+
+#Flag set on encrypted files, which can't be copied without reading them
+_ZIP_ENCRYPTED = 0x1
+
+#Compression types that can be used when writing to a zip
+#Reading will work with any type, as it's stored with each file
+ZIP_CODECS = {'stored': zipfile.ZIP_STORED, 'deflate': zipfile.ZIP_DEFLATED}
+
+try:
+    import bz2
+    ZIP_CODECS['bzip2'] = zipfile.ZIP_BZIP2
+except (ImportError, AttributeError):
+    pass
+
+try:
+    import lzma
+    ZIP_CODECS['lzma'] = zipfile.ZIP_LZMA
+except (ImportError, AttributeError):
+    pass
+
+#Zip files kept open for reading, stored as {path: (handle, (size, modified))}
+_ZIP_HANDLES = {}
+
+#Only one thread can use a file at a time, stored as {path: lock}
+_FILE_LOCKS = {}
+
+_ZIP_HANDLES_LOCK = Lock()
+
+
 def format_name(name, extra_chars=''):
     """Remove any invalid characters for file name."""
     try:
@@ -216,18 +258,154 @@ class CustomOpen(object):
             return self._file_object.read()
         return self.zip.read(str(filename))
 
-    def write(self, data, filename=None):
-        """Write to the file."""
+    def write(self, data, filename=None, codec=None, level=None, align=0):
+        """Write to the file.
+        When writing to a zip, codec can be any key of ZIP_CODECS, and
+        level sets the compression level for deflate and bzip2.
+        Unknown codecs will use deflate.
+        If the codec is 'stored', align can be set so that the data
+        starts at a multiple of that many bytes.
+        """
         if self.zip is None:
             if isinstance(data, (str, unicode)):
                 return self._file_object.write(data.encode('utf-8'))
             return self._file_object.write(data)
         if filename is None:
             raise TypeError('filename required when writing to zip')
-        return self.zip.writestr(str(filename), data)
+        
+        info = zipfile.ZipInfo(str(filename), date_time=time.localtime(time.time())[:6])
+        info.compress_type = _get_compress_type(codec)
+        info.external_attr = 0o600 << 16
+        
+        #Compression levels were added in Python 3.7
+        if level is not None and level >= 0 and sys.version_info >= (3, 7):
+            if info.compress_type == zipfile.ZIP_DEFLATED:
+                return self.zip.writestr(info, data, compresslevel=min(level, 9))
+            if info.compress_type == ZIP_CODECS.get('bzip2'):
+                return self.zip.writestr(info, data, compresslevel=sorted((1, level, 9))[1])
+        
+        self._align(info, align)
+        return self.zip.writestr(info, data)
+
+    def _align(self, info, align):
+        """Pad the extra field of an uncompressed file so the data will start at a multiple of align."""
+        if align and info.compress_type == zipfile.ZIP_STORED:
+            offset = self.zip.fp.tell() + _ZIP_HEADER_SIZE + len(info.filename.encode('utf-8')) + _ZIP_PADDING.size
+            padding = -offset % align
+            info.extra = _ZIP_PADDING.pack(_ZIP_PADDING_ID, padding) + b'\0' * padding
+
+    def _data_offset(self, info):
+        """Find where the data of a file starts within the zip."""
+        #The extra field may be different to the one in the central directory
+        self.zip.fp.seek(info.header_offset + _ZIP_HEADER_SIZE - _ZIP_HEADER_LENGTHS.size)
+        name_length, extra_length = _ZIP_HEADER_LENGTHS.unpack(self.zip.fp.read(_ZIP_HEADER_LENGTHS.size))
+        return info.header_offset + _ZIP_HEADER_SIZE + name_length + extra_length
+
+    def offset(self, filename):
+        """Find where the data of an uncompressed file starts within the zip.
+        Returns None if the file is compressed.
+        """
+        info = self.zip.getinfo(str(filename))
+        if info.compress_type != zipfile.ZIP_STORED:
+            return None
+        return self._data_offset(info)
+
+    def copy(self, source, source_filename, filename, codec=None, level=None, align=0):
+        """Copy a file from another zip.
+        If the compression type matches, the compressed data is copied as it is.
+        Otherwise this is the same as reading and writing the file.
+        """
+        source_info = source.zip.getinfo(str(source_filename))
+        if source_info.compress_type != _get_compress_type(codec) or source_info.flag_bits & _ZIP_ENCRYPTED:
+            return self.write(source.read(source_filename), filename, codec=codec, level=level, align=align)
+        
+        source.zip.fp.seek(source._data_offset(source_info))
+        data = source.zip.fp.read(source_info.compress_size)
+        
+        info = zipfile.ZipInfo(str(filename), date_time=source_info.date_time)
+        for attribute in ('compress_type', 'CRC', 'compress_size', 'file_size', 'external_attr'):
+            setattr(info, attribute, getattr(source_info, attribute))
+        self._align(info, align)
+        
+        #Write the file the same way as zipfile, but without compressing the data
+        zip64 = info.file_size > zipfile.ZIP64_LIMIT or info.compress_size > zipfile.ZIP64_LIMIT
+        info.header_offset = self.zip.fp.tell()
+        self.zip.fp.write(info.FileHeader(zip64))
+        self.zip.fp.write(data)
+        self.zip.filelist.append(info)
+        self.zip.NameToInfo[info.filename] = info
+        self.zip._didModify = True
+        if hasattr(self.zip, 'start_dir'):
+            self.zip.start_dir = self.zip.fp.tell()
  
     def seek(self, amount):
         """Seek to a certain point of the file."""
         if amount is None or self._file_object is None:
             return
-        return self._file_object.seek(amount)
\ No newline at end of file
+        return self._file_object.seek(amount)
+
+
+def _get_compress_type(codec):
+    """Get the zip compression type of a codec, using deflate if it's unknown."""
+    return ZIP_CODECS.get(codec.lower() if codec else None, zipfile.ZIP_DEFLATED)
+
+
+def _file_signature(path):
+    """Get the size and modified time of a file, to check if it has been replaced."""
+    stat = os.stat(path)
+    return (stat.st_size, stat.st_mtime)
+
+
+def _file_lock(path):
+    """Get the lock used when reading or replacing a file."""
+    with _ZIP_HANDLES_LOCK:
+        try:
+            return _FILE_LOCKS[path]
+        except KeyError:
+            lock = _FILE_LOCKS[path] = RLock()
+            return lock
+
+
+@contextmanager
+def cached_open(path):
+    """Open a file for reading with CustomOpen, and keep it open to reuse later.
+    This saves parsing the zip directory again for every read.
+    The file is reopened if it has changed, but replacing_file should be
+    used before replacing it, as open files can't be renamed on Windows.
+    """
+    #Only one thread can read from a handle at a time
+    with _file_lock(path):
+        signature = _file_signature(path)
+        with _ZIP_HANDLES_LOCK:
+            try:
+                handle, handle_signature = _ZIP_HANDLES[path]
+            except KeyError:
+                handle_signature = None
+            if handle_signature != signature:
+                if handle_signature is not None:
+                    handle.__exit__()
+                handle = CustomOpen(path, 'rb')
+                _ZIP_HANDLES[path] = (handle, signature)
+        yield handle
+
+
+def close_cached(path=None):
+    """Close a file opened with cached_open, or all of them if no path is given."""
+    with _ZIP_HANDLES_LOCK:
+        paths = list(_ZIP_HANDLES) if path is None else [path]
+    for path in paths:
+        with _file_lock(path):
+            with _ZIP_HANDLES_LOCK:
+                handle = _ZIP_HANDLES.pop(path, (None, None))[0]
+            if handle is not None:
+                handle.__exit__()
+
+
+@contextmanager
+def replacing_file(path):
+    """Close a file opened with cached_open, and stop it being read until it has been replaced.
+    Without this, another thread could find the file missing halfway through a rename.
+    """
+    with _file_lock(path):
+        close_cached(path)
+        yield
@@ -6,26 +6,40 @@ Source: https://github.com/Peter92/MouseTracks
 
 from __future__ import division, absolute_import
 
-from collections import defaultdict
+from collections import defaultdict, deque
 import time
 import traceback
+from multiprocessing.pool import ThreadPool
+from threading import Thread
 
+from .batch import unpack_frames
 from ..utils import numpy
 from ..applications import RunningApplications
-from ..utils.compatibility import range, iteritems
+from ..utils.compatibility import range, iteritems, queue
 from ..config.settings import CONFIG
 from ..constants import MAX_INT, TRACKING_DISABLE, TRACKING_IGNORE, UPDATES_PER_SECOND, KEY_STATS, DEFAULT_NAME
-from ..files import LoadData, save_data, prepare_file
+from ..files import LoadData, save_data, prepare_file, snapshot_data, append_journal, unload_data, mark_saved
 from ..config.language import LANGUAGE
-from ..utils.maths import find_distance, calculate_line, round_int
-from ..notify import NOTIFY
+from ..utils.maths import find_distance, round_int
+from ..notify import NOTIFY, Notify
 from ..utils.os import MULTI_MONITOR, monitor_info, set_priority
+
+
+#Starting dtype for each map, which will be widened if a larger value is recorded
+#Tracks and StrokesSeparate hold tick counts, Speed and Strokes hold pixel distances
+MAP_DTYPES = {'Tracks': 'uint32', 'Speed': 'uint16', 'Strokes': 'uint16', 'StrokesSeparate': 'uint32', 'Clicks': 'uint16'}
+
+#Maps that may be edited by each type of event, used to write the changes to the journal
+JOURNAL_MAPS = {'Mouse': (('Tracks',), ('Speed',), ('Strokes',),
+                          ('StrokesSeparate', 'Left'), ('StrokesSeparate', 'Middle'), ('StrokesSeparate', 'Right')),
+                'Clicks': (('Clicks', 'Single', 'Left'), ('Clicks', 'Single', 'Middle'), ('Clicks', 'Single', 'Right'),
+                           ('Clicks', 'Double', 'Left'), ('Clicks', 'Double', 'Middle'), ('Clicks', 'Double', 'Right'))}
     
 
-def running_processes(q_recv, q_send, background_send):
+def running_processes(q_recv, q_send):
     """Check for running processes.
     As refreshing the list takes some time but not CPU, this is put in its own thread
-    and sends the currently running program to the backgrund process.
+    and sends the currently running program to the main thread, to be forwarded to the background process.
     """
     try:
         previous_app = None
@@ -106,7 +120,6 @@ def running_processes(q_recv, q_send, background_send):
                     previous_app = current_app
                 
                 if send:
-                    background_send.put(send)
                     q_send.put(send)
     
     #Catch error after KeyboardInterrupt
@@ -117,13 +130,15 @@ def running_processes(q_recv, q_send, background_send):
         q_send.put(traceback.format_exc())
 
 
-def _save_wrapper(q_send, program_name, data):
-    """Handle saving the data files from the thread."""
+def _save_wrapper(q_send, program_name, data, notify=NOTIFY):
+    """Handle saving the data files from the thread.
+    Use a separate notify instance if saving outside the background process loop.
+    """
     
     if program_name is not None and program_name[0] == TRACKING_DISABLE:
-        return
+        return False
     
-    NOTIFY(LANGUAGE.strings['Tracking']['SavePrepare']).put(q_send)
+    notify(LANGUAGE.strings['Tracking']['SavePrepare']).put(q_send)
     saved = False
 
     #Get how many attempts to use
@@ -132,28 +147,119 @@ def _save_wrapper(q_send, program_name, data):
     compressed_data = prepare_file(data)
     
     #Attempt to save
-    NOTIFY(LANGUAGE.strings['Tracking']['SaveStart']).put(q_send)
+    notify(LANGUAGE.strings['Tracking']['SaveStart']).put(q_send)
     for i in range(max_attempts):
         if save_data(program_name, compressed_data, _compress=False):
-            NOTIFY(LANGUAGE.strings['Tracking']['SaveComplete']).put(q_send)
+            notify(LANGUAGE.strings['Tracking']['SaveComplete']).put(q_send)
             saved = True
             break
         
         else:
             if max_attempts == 1:
-                NOTIFY(LANGUAGE.strings['Tracking']['SaveIncompleteNoRetry']).put(q_send)
-                return
+                notify(LANGUAGE.strings['Tracking']['SaveIncompleteNoRetry']).put(q_send)
+                return False
 
             seconds = round_int(CONFIG['Save']['WaitAfterFail'])
             minutes = round_int(CONFIG['Save']['WaitAfterFail'] / 60)
-            NOTIFY(LANGUAGE.strings['Tracking']['SaveIncompleteRetry'], ATTEMPT_CURRENT=i+1, ATTEMPT_MAX=max_attempts,
+            notify(LANGUAGE.strings['Tracking']['SaveIncompleteRetry'], ATTEMPT_CURRENT=i+1, ATTEMPT_MAX=max_attempts,
                    SECONDS=seconds, SECONDS_PLURAL=LANGUAGE.strings['Words'][('TimeSecondSingle', 'TimeSecondPlural')[seconds != 1]],
                    MINUTES=minutes, MINUTES_PLURAL=LANGUAGE.strings['Words'][('TimeMinuteSingle', 'TimeMinutePlural')[minutes != 1]]).put(q_send)
 
             time.sleep(CONFIG['Save']['WaitAfterFail'])
             
     if not saved:
-        NOTIFY(LANGUAGE.strings['Tracking']['SaveIncompleteRetryFail']).put(q_send)
+        notify(LANGUAGE.strings['Tracking']['SaveIncompleteRetryFail']).put(q_send)
+    return saved
+
+
+def _save_profile(q_send, program_name, data, changes, journal):
+    """Save a single profile and report how long it took.
+    
+    If the changes since the last save are known, they will be added to the journal,
+    and the full file will only be saved after a set number of journal entries.
+    The first save of each profile is always a full save.
+
+    This runs in a thread pool, so it has its own notify instance,
+    and the journal is a dict only used by saves of this profile.
+    """
+    notify = Notify()
+    start = time.time()
+    try:
+        saved = _save_or_append(q_send, program_name, data, changes, journal, notify)
+    
+    #Report the error but keep going, as tracking will continue
+    #A full save is done next time, as the journal may be incomplete
+    except Exception as e:
+        journal.clear()
+        notify(LANGUAGE.strings['Tracking']['SaveFailedProfile'], APPLICATION_NAME=program_name,
+               REASON='{}: {}'.format(type(e).__name__, e)).put(q_send)
+        return
+    
+    if saved:
+        notify(LANGUAGE.strings['Tracking']['SaveCompleteProfile'], APPLICATION_NAME=program_name,
+               SECONDS=round(time.time() - start, 2)).put(q_send)
+
+
+def _save_or_append(q_send, program_name, data, changes, journal, notify):
+    """Append the changes to the journal if possible, otherwise save the full file."""
+    
+    #Append to the journal
+    if (changes is not None and journal and journal['Length'] < CONFIG['Save']['JournalLength']
+            and journal['Resolutions'] == set(data['Resolution'])):
+        saved = append_journal(program_name, data, changes, journal['Checkpoint'])
+        if saved:
+            journal['Length'] += 1
+    else:
+        saved = False
+    
+    #Save the full file
+    if not saved:
+        journal.clear()
+        saved = _save_wrapper(q_send, program_name, data, notify=notify)
+        if saved:
+            mark_saved(data)
+            journal.update({'Checkpoint': data['Time']['Checkpoint'],
+                            'Resolutions': set(data['Resolution']),
+                            'Length': 0})
+    return saved
+
+
+def _save_writer(q_save, q_send):
+    """Save snapshots of the data from a separate thread, so tracking isn't paused.
+    Multiple profiles will be saved at once, up to the number of threads set in the config.
+    Send (None, None, None) to report when everything before it has saved, or None to stop.
+
+    Saves of the same profile are never run at once, and each one waits
+    for the previous one to finish so they are written in order.
+    """
+    journals = {}
+    pool = ThreadPool(CONFIG['Save']['Threads'])
+    pending = {}
+    try:
+        while True:
+            save_request = q_save.get()
+            
+            #Wait for every save to finish
+            if save_request is None or save_request[1] is None:
+                for result in pending.values():
+                    result.get()
+                pending = {}
+                if save_request is None:
+                    return
+                q_send.put({'SaveFinished': None})
+                continue
+            
+            program_name, data, changes = save_request
+            if program_name in pending:
+                pending.pop(program_name).get()
+            journal = journals.setdefault(program_name, {})
+            pending[program_name] = pool.apply_async(_save_profile, (q_send, program_name, data, changes, journal))
+    
+    except Exception:
+        q_send.put(traceback.format_exc())
+    
+    finally:
+        pool.close()
 
 
 def _notify_queue_size(queue_main, queue_send=None):
@@ -172,10 +278,10 @@ def background_process(q_recv, q_send):
         NOTIFY(LANGUAGE.strings['Tracking']['ScriptThreadStart']).put(q_send)
         set_priority('low')
         
-        store = {'Data': {None: LoadData()},
+        store = {'Data': {None: LoadData(_tile_size=CONFIG['Advanced']['MapTileSize'])},
                  'Applications': {
                      DEFAULT_NAME: {
-                        'Data': LoadData(),
+                        'Data': LoadData(_tile_size=CONFIG['Advanced']['MapTileSize']),
                         'ActivitySinceLastSave': False,
                         'SavesSinceLastActivity': 0,
                      },
@@ -195,15 +301,24 @@ def background_process(q_recv, q_send):
                  'FirstLoad': True,
                  'LastTrackUpdate': 0,
                  'LastIdle': 0,
-                 'ProcessIDs': defaultdict(set)
+                 'ProcessIDs': defaultdict(set),
+                 'Changes': {}
                 }
         
+        q_save = queue.Queue()
+        save_thread = Thread(target=_save_writer, args=(q_save, q_send))
+        save_thread.daemon = True
+        save_thread.start()
+        
         NOTIFY(LANGUAGE.strings['Tracking']['ProfileLoad'])
         _notify_queue_size(q_recv)
         NOTIFY.put(q_send)
         
+        frames = deque()
         while True:
-            received_data = q_recv.get()
+            while not frames:
+                frames.extend(unpack_frames(q_recv.get()))
+            received_data = frames.popleft()
             data = store['Applications'][store['CurrentProgramName']]['Data']
             
             #Increment the amount of time the script has been running for
@@ -223,7 +338,7 @@ def background_process(q_recv, q_send):
 
                     #Data has been modified
                     if application_data['ActivitySinceLastSave']:
-                        _save_wrapper(q_send, application_name, application_data['Data'])
+                        q_save.put((application_name, snapshot_data(application_data['Data']), _get_changes(store, application_name)))
                         application_data['ActivitySinceLastSave'] = False
                         application_data['SavesSinceLastActivity'] = 0
                         _notify_queue_size(q_recv)
@@ -270,11 +385,13 @@ def background_process(q_recv, q_send):
                                     HOURS=hours, HOURS_PLURAL=hours_plural,
                                     APPLICATION_NAME=application_name
                                 )
-                q_send.put({'SaveFinished': None})
+                q_save.put((None, None, None))
 
                 NOTIFY(str(remove_applications), 2)
                 for application_name in remove_applications:
                     del store['Applications'][application_name]
+                    store['Changes'].pop(application_name, None)
+                    unload_data(application_name)
                     NOTIFY(LANGUAGE.strings['Tracking']['ApplicationUnload'], APPLICATION_NAME=application_name)
 
             update_resolution = False
@@ -305,13 +422,14 @@ def background_process(q_recv, q_send):
                             pass
                         if process_id is not None:
                             store['ProcessIDs'][current_program].add(process_id)
-                        data = LoadData(current_program, _reset_sessions=allow_new_session)
+                        data = LoadData(current_program, _reset_sessions=allow_new_session, _tile_size=CONFIG['Advanced']['MapTileSize'])
                         store['CurrentProgram'] = current_program
                         store['Applications'][store['CurrentProgramName']] = {
                             'Data': data,
                             'ActivitySinceLastSave': False,
                             'SavesSinceLastActivity': 0,
                         }
+                        store['Changes'].pop(store['CurrentProgramName'], None)
                         
                         #Check new resolution
                         try:
@@ -403,6 +521,7 @@ def background_process(q_recv, q_send):
                     NOTIFY(LANGUAGE.strings['Tracking']['CompressStart'], TRACK_TYPE='tracks').put(q_send)
                     
                     compress_tracks(store, CONFIG['Advanced']['CompressTrackAmount'])
+                    store['Changes'][store['CurrentProgramName']] = None
                     
                     NOTIFY(LANGUAGE.strings['Tracking']['CompressEnd'], TRACK_TYPE='tracks')
                     _notify_queue_size(q_recv)
@@ -425,6 +544,8 @@ def background_process(q_recv, q_send):
             data['Ticks']['Recorded'] += 1
             
             if 'Quit' in received_data or 'Exit' in received_data:
+                q_save.put(None)
+                save_thread.join()
                 return
 
             NOTIFY.put(q_send)
@@ -449,28 +570,87 @@ def check_resolution(data, resolution):
         
     #Add empty resolution maps
     if resolution not in data['Resolution']:
-        data['Resolution'][resolution] = {'Tracks': numpy.array(resolution, create=True),
-                                          'Speed': numpy.array(resolution, create=True),
-                                          'Strokes': numpy.array(resolution, create=True),
-                                          'StrokesSeparate': {'Left': numpy.array(resolution, create=True),
-                                                              'Middle': numpy.array(resolution, create=True),
-                                                              'Right': numpy.array(resolution, create=True)},
-                                          'Clicks': {'Single': {'Left': numpy.array(resolution, create=True),
-                                                                'Middle': numpy.array(resolution, create=True),
-                                                                'Right': numpy.array(resolution, create=True)},
-                                                     'Double': {'Left': numpy.array(resolution, create=True),
-                                                                'Middle': numpy.array(resolution, create=True),
-                                                                'Right': numpy.array(resolution, create=True)}}}
-
+        tile_size = CONFIG['Advanced']['MapTileSize']
+        maps = {'Tracks': numpy.array(resolution, create=True, dtype=MAP_DTYPES['Tracks'], tile_size=tile_size),
+                'Speed': numpy.array(resolution, create=True, dtype=MAP_DTYPES['Speed'], tile_size=tile_size),
+                'Strokes': numpy.array(resolution, create=True, dtype=MAP_DTYPES['Strokes'], tile_size=tile_size),
+                'StrokesSeparate': {}, 'Clicks': {'Single': {}, 'Double': {}}}
+        for mouse_button in ('Left', 'Middle', 'Right'):
+            maps['StrokesSeparate'][mouse_button] = numpy.array(resolution, create=True, dtype=MAP_DTYPES['StrokesSeparate'], tile_size=tile_size)
+            maps['Clicks']['Single'][mouse_button] = numpy.array(resolution, create=True, dtype=MAP_DTYPES['Clicks'], tile_size=tile_size)
+            maps['Clicks']['Double'][mouse_button] = numpy.array(resolution, create=True, dtype=MAP_DTYPES['Clicks'], tile_size=tile_size)
+        data['Resolution'][resolution] = maps
                                         
+class MonitorIndex(object):
+    """Lookup table to find which monitor coordinates are on.
+    The monitor the mouse was last on is checked first, as it will rarely change.
+    Use MonitorIndex.get to reuse the same index until the monitor limits change.
+    """
+    _cache = None
+
+    def __init__(self, monitor_limits):
+        self.monitor_limits = monitor_limits
+        self.limits = [(x1, y1, x2, y2) for x1, y1, x2, y2 in monitor_limits or ()]
+        self.monitors = [((x2 - x1, y2 - y1), (x1, y1)) for x1, y1, x2, y2 in self.limits]
+        self.last = None
+
+        #If any monitors overlap, the first match must always be used
+        self._overlap = any(a[0] < b[2] and b[0] < a[2] and a[1] < b[3] and b[1] < a[3]
+                            for i, a in enumerate(self.limits) for b in self.limits[i+1:])
+
+    @classmethod
+    def get(cls, monitor_limits):
+        """Get the index for a list of monitor limits, only building a new one if they change."""
+        index = cls._cache
+        if index is None or index.monitor_limits is not monitor_limits and index.monitor_limits != monitor_limits:
+            index = cls._cache = cls(monitor_limits)
+        return index
+
+    def _hint(self):
+        if not self._overlap:
+            return self.last
+
+    def find(self, x, y):
+        """Get the index of the monitor a coordinate is on."""
+        hint = self._hint()
+        if hint is not None:
+            x1, y1, x2, y2 = self.limits[hint]
+            if x1 <= x < x2 and y1 <= y < y2:
+                return hint
+        for i, (x1, y1, x2, y2) in enumerate(self.limits):
+            if x1 <= x < x2 and y1 <= y < y2:
+                self.last = i
+                return i
+
+    def offset(self, coordinate):
+        """Get the resolution and offset of the monitor a coordinate is on."""
+        if coordinate is None:
+            return
+        i = self.find(*coordinate)
+        if i is not None:
+            return self.monitors[i]
+
+    def split(self, xs, ys):
+        """Group arrays of coordinates by which monitor they are on.
+        A line crossing multiple monitors is split in a single pass.
+        Returns a list of (resolution, (xs, ys), indexes) with the offset removed,
+        along with the indexes of the coordinates that didn't match any monitor.
+        """
+        groups, unmatched = numpy.split_by_region(xs, ys, self.limits, hint=self._hint())
+        result = []
+        for i, indexes in groups:
+            resolution, (x_offset, y_offset) = self.monitors[i]
+            result.append((resolution, (xs[indexes] - x_offset, ys[indexes] - y_offset), indexes))
+
+            #Remember where the line finished
+            if indexes[-1] == len(xs) - 1:
+                self.last = i
+        return result, unmatched
+
+
 def monitor_offset(coordinate, monitor_limits):
     """Detect which monitor the mouse is currently over."""
-    if coordinate is None:
-        return
-    mx, my = coordinate
-    for x1, y1, x2, y2 in monitor_limits:
-        if x1 <= mx < x2 and y1 <= my < y2:
-            return ((x2 - x1, y2 - y1), (x1, y1))
+    return MonitorIndex.get(monitor_limits).offset(coordinate)
 
 
 def get_monitor_coordinate(x, y, store):
@@ -502,6 +682,38 @@ def get_monitor_coordinate(x, y, store):
         resolution = store['Resolution']
         
         return ((x, y), resolution)
+
+
+def split_by_monitor(xs, ys, monitor_limits):
+    """Group arrays of coordinates by which monitor they are on.
+    Each coordinate is matched to the first valid monitor, the same as monitor_offset.
+    Returns a list of (resolution, (xs, ys), indexes) with the offset removed,
+    along with the indexes of the coordinates that didn't match any monitor.
+    """
+    return MonitorIndex.get(monitor_limits).split(xs, ys)
+
+
+def get_monitor_coordinates(xs, ys, store):
+    """Find the resolution of the monitor and adjusted coordinates for arrays of x and y values.
+    This is the same as get_monitor_coordinate, but groups the results by resolution.
+    """
+    if store['ApplicationResolution'] is not None:
+        groups = split_by_monitor(xs, ys, [store['ApplicationResolution'][0]])[0]
+        return [(resolution, coordinates) for resolution, coordinates, _ in groups]
+    
+    elif MULTI_MONITOR:
+        groups, unmatched = split_by_monitor(xs, ys, store['MonitorLimits'])
+        
+        #Refresh the monitors once if anything was out of bounds
+        if unmatched.size:
+            store['MonitorLimits'] = monitor_info()
+            groups += split_by_monitor(xs[unmatched], ys[unmatched], store['MonitorLimits'])[0]
+        for resolution, _, _ in groups:
+            check_resolution(store['Applications'][store['CurrentProgramName']]['Data'], resolution)
+        return [(resolution, coordinates) for resolution, coordinates, _ in groups]
+    
+    else:
+        return [(store['Resolution'], (xs, ys))]
         
 
 def history_trim(store, desired_length):
@@ -535,6 +747,32 @@ def history_trim(store, desired_length):
     return False
 
 
+def _record_changes(store, resolution, map_group, indices):
+    """Remember which pixels have been edited since the last save, so only those need saving."""
+    changes = store['Changes'].setdefault(store['CurrentProgramName'], {})
+    if changes is not None:
+        changes.setdefault((resolution, map_group), []).append(numpy.array(indices[0]) * resolution[0] + indices[1])
+
+
+def _get_changes(store, application_name):
+    """Get the pixels edited since the last save for each map.
+    Returns None if the changes aren't known.
+    """
+    try:
+        changes = store['Changes'].pop(application_name)
+    except KeyError:
+        return {}
+    if changes is None:
+        return None
+    
+    result = {}
+    for (resolution, map_group), indices in iteritems(changes):
+        indices = numpy.sort(numpy.concatenate(indices), unique=True)
+        for keys in JOURNAL_MAPS[map_group]:
+            result[(resolution, keys)] = indices
+    return result
+
+
 def _record_click(store, received_data, click_type):
     for mouse_button_index, (x, y) in received_data:
         
@@ -544,7 +782,9 @@ def _record_click(store, received_data, click_type):
             continue
         
         mouse_button = ['Left', 'Middle', 'Right'][mouse_button_index]
-        store['Applications'][store['CurrentProgramName']]['Data']['Resolution'][resolution]['Clicks'][click_type][mouse_button][y][x] += 1
+        click_maps = store['Applications'][store['CurrentProgramName']]['Data']['Resolution'][resolution]['Clicks'][click_type]
+        click_maps[mouse_button] = numpy.add_at(click_maps[mouse_button], ([y], [x]), 1)
+        _record_changes(store, resolution, 'Clicks', ([y], [x]))
 
 
 def record_click_single(store, received_data):
@@ -676,12 +916,25 @@ def record_key_held(store, received_data):
         _record_keypress(data['Keys'], 'Held', key)
         
         
+def _record_mouse_path(maps, indices, ticks, distance, clicked, continuous):
+    """Write a batch of pixels to the maps of a single resolution.
+    The indices are a tuple of (y, x) arrays, and may contain duplicates.
+    """
+    maps['Tracks'] = numpy.assign(maps['Tracks'], indices, ticks)
+    if continuous:
+        maps['Speed'] = numpy.maximum_at(maps['Speed'], indices, distance)
+        if clicked:
+            maps['Strokes'] = numpy.maximum_at(maps['Strokes'], indices, distance)
+        
+        #Testing separate maps for strokes
+        for mouse_button, click_type in enumerate(('Left', 'Middle', 'Right')):
+            maps['StrokesSeparate'][click_type] = numpy.assign(maps['StrokesSeparate'][click_type], indices, ticks if mouse_button in clicked else 0)
+
+
 def record_mouse_move(store, received_data):
     data = store['Applications'][store['CurrentProgramName']]['Data']
 
     store['Applications'][store['CurrentProgramName']]['ActivitySinceLastSave'] = True
-    resolution = 0
-    _resolution = -1
     
     start, end, clicked = received_data
     distance = find_distance(end, start)
@@ -692,57 +945,31 @@ def record_mouse_move(store, received_data):
     
     #Calculate the pixels in the line
     if start is None:
-        mouse_coordinates = [end]
+        xs, ys = numpy.calculate_lines([end])
     else:
-        mouse_coordinates = [start] + calculate_line(start, end) + [end]
+        xs, ys = numpy.calculate_lines([start, end])
         
     #Make sure resolution exists in data
     if store['ApplicationResolution'] is not None:
         check_resolution(data, store['ApplicationResolution'][1])
         
+    #Skip the line if it starts off the screen
+    #The resolutions are checked when splitting the line by monitor
     elif MULTI_MONITOR:
-        try:
-            #Don't bother calculating offset for each pixel
-            #if both start and end are on the same monitor
-            resolution, (x_offset, y_offset) = monitor_offset(start, store['MonitorLimits'])
-            _resolution = monitor_offset(end, store['MonitorLimits'])[0]
-        except TypeError:
-            if not resolution:
-                mouse_coordinates = []
-        else:
-            check_resolution(data, resolution)
-            if resolution != _resolution:
-                check_resolution(data, resolution)
-            _resolutions = [resolution, _resolution]
-    
-    #Write each pixel to the dictionary
-    for (x, y) in mouse_coordinates:
+        if monitor_offset(start, store['MonitorLimits']) is None:
+            xs = ys = xs[:0]
     
-        try:
-            (x, y), resolution = get_monitor_coordinate(x, y, store)
-        except TypeError:
-            continue
-        
-        try:
-            data['Resolution'][resolution]['Tracks'][y][x] = data['Ticks']['Tracks']
-            if continuous:
-                old_value = data['Resolution'][resolution]['Speed'][y][x]
-                data['Resolution'][resolution]['Speed'][y][x] = max(distance, old_value)
-                if clicked:
-                    old_value = data['Resolution'][resolution]['Strokes'][y][x]
-                    data['Resolution'][resolution]['Strokes'][y][x] = max(distance, old_value)
-                
-                #Testing separate maps for strokes
-                for mouse_button, click_type in enumerate(('Left', 'Middle', 'Right')):
-                    if mouse_button in clicked:
-                        data['Resolution'][resolution]['StrokesSeparate'][click_type][y][x] = data['Ticks']['Tracks']
-                    else:
-                        data['Resolution'][resolution]['StrokesSeparate'][click_type][y][x] = 0
-        
-        #The IndexError here is super rare and I can't replicate it,
-        #so may as well just ignore
-        except TypeError:
-            pass
+    #Write all the pixels at once, grouped by resolution
+    if xs.size:
+        for resolution, (x, y) in get_monitor_coordinates(xs, ys, store):
+            
+            #The IndexError here is super rare and I can't replicate it,
+            #so may as well just ignore
+            try:
+                _record_mouse_path(data['Resolution'][resolution], (y, x), data['Ticks']['Tracks'], distance, clicked, continuous)
+                _record_changes(store, resolution, 'Mouse', (y, x))
+            except TypeError:
+                pass
     
     store['LastTrackUpdate'] = data['Ticks']['Total']
     data['Ticks']['Tracks'] += 1
\ No newline at end of file
@@ -0,0 +1,126 @@
+"""This is part of the Mouse Tracks Python application.
+Source: https://github.com/Peter92/MouseTracks
+"""
+#Group the frame data from multiple ticks into a single message
+#Mouse movement and ticks are stored in columns, as they are sent almost every tick
+
+from __future__ import absolute_import
+
+import time
+from array import array
+
+from ..utils.compatibility import range
+
+
+#Send the batch straight away if any of these are in a frame
+FLUSH_KEYS = ('Save', 'Quit', 'Exit')
+
+
+def _pixel(position):
+    """Convert a position to integers, as some platforms give the cursor position as floats."""
+    return (int(round(position[0])), int(round(position[1])))
+
+
+class FrameBatch(object):
+    """Collect frames until the batch is full or too old, then send them as one message.
+    Use unpack_frames to get the original frames back.
+    """
+    def __init__(self, queue, size=1, latency=0):
+        self.queue = queue
+        self.size = max(1, size)
+        self.latency = latency / 1000
+        self._reset()
+
+    def __len__(self):
+        return self.count
+
+    def _reset(self):
+        self.count = 0
+        self.started = None
+        self.ticks = array('l')
+        self.mouse_index = array('l')
+        self.mouse_start = array('l')
+        self.mouse_end = array('l')
+        self.mouse_clicked = array('B')
+        self.other = []
+
+    def add(self, frame_data):
+        """Add the data from a single tick."""
+        if not self.count:
+            self.started = time.time()
+        frame_data = dict(frame_data)
+
+        ticks = frame_data.pop('Ticks', None)
+        if ticks is None:
+            self.ticks.extend((-1, -1))
+        else:
+            self.ticks.extend((ticks['Total'], ticks['Idle']))
+
+        #Store the start as the end if it doesn't exist, and use the sign of the index to tell them apart
+        try:
+            start, end, clicked = frame_data.pop('MouseMove')
+        except KeyError:
+            pass
+        else:
+            self.mouse_index.append(self.count if start is not None else -self.count - 1)
+            end = _pixel(end)
+            self.mouse_start.extend(end if start is None else _pixel(start))
+            self.mouse_end.extend(end)
+            self.mouse_clicked.append(sum(1 << mouse_button for mouse_button in set(clicked)))
+
+        if frame_data:
+            self.other.append((self.count, frame_data))
+        self.count += 1
+
+        if self.count >= self.size or any(key in frame_data for key in FLUSH_KEYS):
+            self.flush()
+
+    def check(self):
+        """Send the batch if it has been waiting for too long.
+        This should be run every tick.
+        """
+        if self.count and time.time() - self.started >= self.latency:
+            self.flush()
+
+    def flush(self):
+        """Send the current batch."""
+        if not self.count:
+            return
+        self.queue.put({'Batch': {'Count': self.count,
+                                  'Ticks': self.ticks,
+                                  'MouseMove': (self.mouse_index, self.mouse_start, self.mouse_end, self.mouse_clicked),
+                                  'Other': self.other}})
+        self._reset()
+
+
+def unpack_frames(received_data):
+    """Convert a batch back into the original frames.
+    Anything that isn't a batch will be returned as it is.
+    """
+    try:
+        batch = received_data['Batch']
+    except (KeyError, TypeError):
+        return [received_data]
+
+    frames = [{} for _ in range(batch['Count'])]
+
+    ticks = batch['Ticks']
+    for i, frame_data in enumerate(frames):
+        if ticks[i * 2] >= 0:
+            frame_data['Ticks'] = {'Total': ticks[i * 2], 'Idle': ticks[i * 2 + 1]}
+
+    mouse_index, mouse_start, mouse_end, mouse_clicked = batch['MouseMove']
+    for i, index in enumerate(mouse_index):
+        end = (mouse_end[i * 2], mouse_end[i * 2 + 1])
+        if index < 0:
+            index = -index - 1
+            start = None
+        else:
+            start = (mouse_start[i * 2], mouse_start[i * 2 + 1])
+        clicked = [mouse_button for mouse_button in range(8) if mouse_clicked[i] & 1 << mouse_button]
+        frames[index]['MouseMove'] = [start, end, clicked]
+
+    for index, frame_data in batch['Other']:
+        frames[index].update(frame_data)
+
+    return frames
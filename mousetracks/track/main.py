@@ -12,6 +12,7 @@ from multiprocessing import Process, Queue
 from threading import Thread
 
 from .background import background_process, running_processes, monitor_offset, _notify_queue_size
+from .batch import FrameBatch
 from .xinput import Gamepad
 from ..api import *
 from ..misc import format_file_path
@@ -23,6 +24,7 @@ from ..files import Lock
 from ..messages import time_format
 from ..notify import NOTIFY
 from ..utils.compatibility import Message, MessageWithQueue, iteritems
+from ..utils.ringbuffer import RingBuffer
 from ..utils.os import monitor_info, get_cursor_pos, get_mouse_click, get_key_press, MULTI_MONITOR, get_double_click_time
 from ..utils.sockets import get_free_port
 
@@ -81,7 +83,7 @@ def track(lock=True, web_port=None, message_port=None, console=True, server_secr
 
 def _track(web_port=None, message_port=None, server_secret=None):
     
-    _background_process = None
+    _background_process = q_bg_send = None
     no_detection_wait = 2
     
     try:
@@ -100,7 +102,8 @@ def _track(web_port=None, message_port=None, server_secret=None):
             message_thread = None
             
         #Setup web server
-        if CONFIG['API']['WebServer']:
+        app = get_app()
+        if app is not None:
             app.config.update(create_pipe('REQUEST', duplex=False))
             app.config.update(create_pipe('CONTROL', duplex=False))
             app.config.update(create_pipe('STATUS', duplex=False))
@@ -153,14 +156,18 @@ def _track(web_port=None, message_port=None, server_secret=None):
         mouse_pos = store['Mouse']['Position']
         #Start background processes
         q_bg_recv = Queue()
-        q_bg_send = Queue()
+        if CONFIG['Advanced']['SharedMemoryQueue'] and RingBuffer.supported:
+            q_bg_send = RingBuffer(CONFIG['Advanced']['SharedMemoryQueueSize'] * 1024)
+        else:
+            q_bg_send = Queue()
+        batch = FrameBatch(q_bg_send, CONFIG['Advanced']['EventBatchSize'], CONFIG['Advanced']['EventBatchLatency'])
         _background_process = Process(target=background_process, args=(q_bg_send, q_bg_recv))
         _background_process.daemon = True
         _background_process.start()
         
         q_rp_recv = Queue()
         q_rp_send = Queue()
-        _running_programs = Thread(target=running_processes, args=(q_rp_send, q_rp_recv, q_bg_send))
+        _running_programs = Thread(target=running_processes, args=(q_rp_send, q_rp_recv))
         _running_programs.daemon = True
         _running_programs.start()
         
@@ -214,12 +221,13 @@ def _track(web_port=None, message_port=None, server_secret=None):
                         frame_data['Ticks'] = {'Total': last_sent,
                                                'Idle': ticks - store['LastActivity']}
                         if frame_data:
-                            q_bg_send.put(frame_data)
+                            batch.add(frame_data)
                         if frame_data_rp:
                             q_rp_send.put(frame_data_rp)
                         store['LastSent'] = ticks
                 except NameError:
                     pass
+                batch.check()
                 
                 #Get messages from running program thread
                 while not q_rp_recv.empty():
@@ -228,14 +236,20 @@ def _track(web_port=None, message_port=None, server_secret=None):
                     #End if exception was raised
                     try:
                         if received_message.startswith('Traceback (most recent call last)'):
+                            batch.flush()
                             q_bg_send.put({'Quit': True})
                             return received_message, store['Flask']['Port']['Web']
 
-                    #Do not continue tracking held down keys after profile switch
                     except AttributeError:
                         if isinstance(received_message, dict):
+                        
+                            #Do not continue tracking held down keys after profile switch
                             if 'Program' in received_message:
                                 store['Keyboard']['KeysInvalid'] |= set([k for k, v in iteritems(store['Keyboard']['KeysPressed']) if v])
+                            
+                            #Send any waiting frames before the program changes
+                            batch.flush()
+                            q_bg_send.put(received_message)
                         
                     #Print messages from thread
                     else:
@@ -250,6 +264,7 @@ def _track(web_port=None, message_port=None, server_secret=None):
                     #Receive text messages, quit if exception
                     try:
                         if received_message.startswith('Traceback (most recent call last)'):
+                            batch.flush()
                             q_bg_send.put({'Quit': True})
                             return received_message, store['Flask']['Port']['Web']
                     except AttributeError:
@@ -677,11 +692,16 @@ def _track(web_port=None, message_port=None, server_secret=None):
                 else:
                     mouse_pos['Previous'] = mouse_pos['Current']
                 ticks += 1
+        
+        #Save and stop the background process
+        batch.flush()
+        q_bg_send.put({'Quit': True})
                 
     except Exception as e:
         traceback_message = traceback.format_exc()
         if _background_process is not None:
             try:
+                batch.flush()
                 q_bg_send.put({'Quit': True})
             except IOError:
                 pass
@@ -694,6 +714,7 @@ def _track(web_port=None, message_port=None, server_secret=None):
     except KeyboardInterrupt:
         if _background_process is not None:
             try:
+                batch.flush()
                 q_bg_send.put({'Quit': True})
             except IOError:
                 pass
@@ -701,6 +722,13 @@ def _track(web_port=None, message_port=None, server_secret=None):
         NOTIFY(LANGUAGE.strings['Tracking']['ScriptMainEnd'])
         message(NOTIFY.output())
     
+    finally:
+        #Wait for the background process to finish with the shared memory before removing it
+        if isinstance(q_bg_send, RingBuffer):
+            if _background_process is not None:
+                _background_process.join()
+            q_bg_send.close()
+    
     #The web port is always returned so set it even if the script failed
     try:
         web_port = store['Flask']['Port']['Web']
@@ -9,7 +9,7 @@ import numpy
 from functools import wraps
 
 from .compatibility import StringIO, BytesIO
-from ..misc import CustomOpen
+from ..misc import CustomOpen, cached_open
 
 
 _NUMPY_DTYPES = {
@@ -34,6 +34,17 @@ _NUMPY_DTYPES = {
     'complex128': numpy.complex128,
 }
 
+def _get_array(array, dense=True):
+    """Get the numpy array from a LazyLoader or TiledArray class.
+    Set dense to False to keep any TiledArray classes.
+    """
+    if isinstance(array, LazyLoader):
+        array = array.array
+    if dense and isinstance(array, TiledArray):
+        array = array.array
+    return array
+
+
 def process_numpy_array(func):
     """Convert LazyLoader class to numpy array if required."""
     @wraps(func)
@@ -43,9 +54,7 @@ def process_numpy_array(func):
         except KeyError:
             array = args[0]
             args = args[1:]
-        if isinstance(array, LazyLoader):
-            array = array.array
-        return func(array, *args, **kwargs)
+        return func(_get_array(array), *args, **kwargs)
     return wrapper
 
 def process_numpy_arrays(func):
@@ -57,7 +66,7 @@ def process_numpy_arrays(func):
         except KeyError:
             arrays = args[0]
             args = args[1:]
-        arrays = [array.array if isinstance(array, LazyLoader) else array for array in arrays]
+        arrays = [_get_array(array) for array in arrays]
         return func(arrays, *args, **kwargs)
     return wrapper
 
@@ -81,8 +90,14 @@ def set_type(array, dtype):
         
         
 @process_numpy_array
-def array(array, create=False, dtype=None):
+def array(array, create=False, dtype=None, tile_size=0):
+    """Create a numpy array.
+    If create is set, the input will be used as the (width, height),
+    and tile_size may be set to create an empty TiledArray instead.
+    """
     if create:
+        if tile_size:
+            return TiledArray(array[::-1], dtype=_get_dtype(dtype), tile_size=tile_size)
         return numpy.zeros(array[::-1], dtype=_get_dtype(dtype))
     return numpy.array(array, dtype=_get_dtype(dtype))
 
@@ -130,10 +145,17 @@ def multiply(array, amount, dtype=None):
     return numpy.multiply(array, amount, dtype=_get_dtype(dtype))
     
     
-@process_numpy_array
 def divide(array, amount, as_int=False, dtype=None):
+    array = _get_array(array, dense=False)
+    if isinstance(array, TiledArray):
+        return array.map(divide, amount, as_int=as_int, dtype=dtype)
     if as_int:
-        return numpy.floor_divide(array, amount, dtype=_get_dtype(dtype))
+        result = numpy.floor_divide(array, amount, dtype=_get_dtype(dtype))
+        
+        #Keep the original integer type
+        if dtype is None and array.dtype.kind in 'ui':
+            return result.astype(array.dtype)
+        return result
     return numpy.true_divide(array, amount, dtype=_get_dtype(dtype))
 
 
@@ -207,10 +229,33 @@ def remap_to_range(array, dtype=None):
     For example, the values (0, 1, 1.1, 1.5, 50, 50.002, 1054)
     will be remapped to (0, 1, 2, 3, 4, 5, 6).
     """
-    values = {v: i for i, v in enumerate(sorted(set(array.ravel())))}
-    return convert_to_dict(array, values, dtype)
+    #Most values are usually 0, so leave them out when sorting
+    values = array[array != 0]
+    if values.size < array.size:
+        values = numpy.append(values, 0)
+    values = numpy.unique(values)
+    return numpy.searchsorted(values, array).astype(numpy.float64 if dtype is None else _get_dtype(dtype))
 
     
+@process_numpy_array
+def quantile_unique(array, amount):
+    """Get the value a certain amount through the sorted unique values of an array.
+    
+    To avoid sorting, any values above the minimum are treated as unique,
+    which is normally true for a blurred heatmap. This is exact if there
+    are no repeated values above the minimum, otherwise each repeated
+    value can move the result up by at most one position.
+    """
+    low = numpy.amin(array)
+    values = array[array > low]
+    index = int(numpy.round((values.size + 1) * amount))
+    if index > values.size:
+        index = values.size
+    if index <= 0:
+        return low
+    return numpy.partition(values, index - 1)[index - 1]
+
+
 @process_numpy_array
 def csv(array):
     io = StringIO
@@ -238,22 +283,466 @@ def fill(array, value):
     return array
 
 
+@process_numpy_array
+def clip(array, low, high):
+    """Limit the values of an array.
+    Integer arrays are edited in place, as they are usually temporary.
+    """
+    if array.dtype.kind in 'ui':
+        return numpy.clip(array, low, high, out=array)
+    return numpy.clip(array, low, high)
+
+
+def take(array, indices):
+    """Use an array of indices to look up rows from another array."""
+    return numpy.take(array, indices, axis=0)
+
+
+@process_numpy_arrays
+def concatenate(arrays):
+    return numpy.concatenate(arrays)
+
+
+def unravel_index(indices, shape):
+    """Convert flat indices to a tuple of index arrays."""
+    return numpy.unravel_index(indices, shape)
+
+
+def split_by_region(xs, ys, regions, hint=None):
+    """Group (x, y) coordinates by the first (x1, y1, x2, y2) region they are inside.
+    If hint is set, that region is checked first, so that every coordinate
+    doesn't need comparing against every region when they all fit inside it.
+
+    Returns a list of (region index, indexes) sorted by region, along with
+    the indexes of any coordinates that are not inside a region.
+    The indexes in each group stay in their original order.
+    """
+    xs = numpy.asarray(xs)
+    ys = numpy.asarray(ys)
+    if hint is not None and xs.size:
+        x1, y1, x2, y2 = regions[hint]
+        if x1 <= xs.min() and xs.max() < x2 and y1 <= ys.min() and ys.max() < y2:
+            return [(hint, numpy.arange(xs.size))], numpy.arange(0)
+
+    #Label each coordinate with its region, going backwards so the first match is kept
+    keys = numpy.full(xs.shape, -1, dtype=numpy.intp)
+    for i in range(len(regions) - 1, -1, -1):
+        x1, y1, x2, y2 = regions[i]
+        keys[(x1 <= xs) & (xs < x2) & (y1 <= ys) & (ys < y2)] = i
+
+    #Sort and split instead of masking once per region
+    order = numpy.argsort(keys, kind='stable')
+    boundaries = numpy.flatnonzero(numpy.diff(keys[order])) + 1
+    groups = []
+    unmatched = order[:0]
+    for group in numpy.split(order, boundaries):
+        if not group.size:
+            continue
+        key = int(keys[group[0]])
+        if key < 0:
+            unmatched = group
+        else:
+            groups.append((key, group))
+    return groups, unmatched
+
+
+def calculate_lines(points, return_index=False):
+    """Calculate the pixels along a path of (x, y) points.
+    Every segment of the path is calculated at the same time.
+
+    The pixels match the staircase drawn by maths.calculate_line, where
+    each pixel is a single step along one axis, and the corner next to
+    the end point is cut off. This is done with integers, so the only
+    difference is where the floats in the old method rounded wrongly.
+
+    Returns separate arrays of x and y values, which include the
+    start and end points, and don't repeat the points between segments.
+    If return_index is set, the index of the point each pixel is
+    travelling towards will also be returned.
+    """
+    points = numpy.asarray(points)
+    if points.dtype.kind == 'f':
+        points = numpy.round(points)
+    points = points.astype(numpy.int64).reshape(-1, 2)
+
+    #Get the number of pixels in each segment, not including the end
+    starts = points[:-1]
+    differences = points[1:] - starts
+    distances = numpy.abs(differences)
+    steps = distances.sum(axis=1)
+    lengths = steps - ((distances > 0).all(axis=1) & (steps > 2))
+
+    #Find which segment each pixel is on, and how many steps along it is
+    segments = numpy.repeat(numpy.arange(len(lengths)), lengths)
+    step = numpy.arange(segments.size) - numpy.repeat(numpy.cumsum(lengths) - lengths, lengths)
+
+    #Count how many of the steps have been along the x axis
+    distances = distances[segments]
+    x_steps = numpy.maximum((distances[:, 0] * (step + 1) - 1) // numpy.maximum(steps[segments], 1), 0)
+    offsets = numpy.stack((x_steps, step - x_steps), axis=1) * numpy.sign(differences[segments])
+    pixels = numpy.concatenate((starts[segments] + offsets, points[-1:]))
+
+    if return_index:
+        index = numpy.append(segments + 1, len(points) - 1)
+        return pixels[:, 0], pixels[:, 1], index
+    return pixels[:, 0], pixels[:, 1]
+
+
+def _fit_dtype(dtype, low, high):
+    """Find the smallest integer dtype that can contain the current one and a range of values.
+    Any non integer dtype will be left alone.
+    """
+    dtype = numpy.dtype(dtype)
+    if dtype.kind not in 'ui':
+        return dtype
+    limits = numpy.iinfo(dtype)
+    if limits.min <= low and high <= limits.max:
+        return dtype
+    dtype = numpy.promote_types(dtype, numpy.min_scalar_type(int(high)))
+    return numpy.promote_types(dtype, numpy.min_scalar_type(int(low)))
+
+
+def _widen(array, low, high):
+    """Widen the dtype of an array if the values don't fit.
+    LazyLoader and TiledArray classes are converted in place, otherwise a new array is returned.
+    """
+    current = _get_array(array, dense=False)
+    dtype = _fit_dtype(current.dtype, low, high)
+    if dtype == current.dtype:
+        return array
+    if isinstance(current, TiledArray):
+        current.set_type(dtype)
+        return array
+    if isinstance(array, LazyLoader):
+        array._array = current.astype(dtype)
+        return array
+    return current.astype(dtype)
+
+
+def _get_writable(array):
+    """Get the array to edit, and mark any LazyLoader class as modified."""
+    if isinstance(array, LazyLoader):
+        array.edited()
+    return _get_array(array, dense=False)
+
+
+def _value_range(value):
+    """Get the lowest and highest integer of a value or array."""
+    value = numpy.asarray(value)
+    if not value.size or value.dtype.kind not in 'uib':
+        return 0, 0
+    return int(value.min()), int(value.max())
+
+
+def assign(array, indices, value):
+    """Set every index to a value.
+    The indices should be a tuple of (y, x) arrays.
+    
+    The array will be widened if the value doesn't fit, so always use the returned array.
+    """
+    array = _widen(array, *_value_range(value))
+    current = _get_writable(array)
+    if isinstance(current, TiledArray):
+        current.assign(indices, value)
+    else:
+        current[indices] = value
+    return array
+
+
+def maximum_at(array, indices, value):
+    """Set every index to the max of the value and what it currently is.
+    Unlike array[indices] = max(...), this works correctly with duplicate indices.
+    
+    The array will be widened if the value doesn't fit, so always use the returned array.
+    """
+    array = _widen(array, *_value_range(value))
+    current = _get_writable(array)
+    if isinstance(current, TiledArray):
+        current.maximum_at(indices, value)
+    else:
+        numpy.maximum.at(current, indices, value)
+    return array
+
+
+def add_at(array, indices, value):
+    """Add a value to every index.
+    Like maximum_at, this works correctly with duplicate indices.
+    
+    The array will be widened if the result doesn't fit, so always use the returned array.
+    """
+    count = numpy.size(indices[0])
+    if count:
+        #Assume the worst case of every value being added to the same index
+        low, high = _value_range(value)
+        current_low, current_high = _value_range(_get_array(array, dense=False)[indices])
+        array = _widen(array, current_low + (low * count if low < 0 else 0), current_high + (high * count if high > 0 else 0))
+    current = _get_writable(array)
+    if isinstance(current, TiledArray):
+        current.add_at(indices, value)
+    else:
+        numpy.add.at(current, indices, value)
+    return array
+
+
+def copy(array):
+    """Copy an array.
+    LazyLoader classes that aren't loaded will not be read.
+    """
+    if isinstance(array, (LazyLoader, TiledArray)):
+        return array.copy()
+    return numpy.copy(array)
+
+
+@process_numpy_array
+def compact(array, dtype='uint16'):
+    """Convert an array to the smallest dtype that will fit every value.
+    Arrays containing only whole numbers will be converted to integers.
+    """
+    if array.dtype.kind not in 'uif':
+        return array
+    if not array.size:
+        return array.astype(_get_dtype(dtype))
+    
+    low = numpy.amin(array)
+    high = numpy.amax(array)
+    if array.dtype.kind == 'f':
+        if not -2 ** 63 <= low <= high < 2 ** 63 or (array != numpy.floor(array)).any():
+            return array
+    return array.astype(_fit_dtype(_get_dtype(dtype), low, high), copy=False)
+
+
+def _nearest_bounds(size, target_size):
+    """Find the range of target indexes each index fills when upscaling.
+    This matches the nearest neighbour zoom in scipy, where a target
+    index is mapped back with floor(i * (size-1) / (target_size-1) + 0.5).
+    """
+    zoom = (size - 1) / (target_size - 1) if target_size > 1 else 1
+    sources = numpy.floor(numpy.arange(target_size) * zoom + 0.5).astype(numpy.intp)
+    indices = numpy.arange(size)
+    return numpy.searchsorted(sources, indices, 'left'), numpy.searchsorted(sources, indices, 'right')
+
+
+def upscale_add(arrays, resolution, dtype='float64'):
+    """Upscale a list of arrays with nearest neighbour and add them together.
+
+    Each nonzero value is drawn as a rectangle on a summed area table,
+    so the time depends on the number of values and not the size of the
+    arrays. The result is the same as merging the upscaled arrays.
+    """
+    width, height = resolution
+    table = numpy.zeros((height + 1, width + 1), dtype=_get_dtype(dtype))
+    for array in arrays:
+        array = _get_array(array)
+        ys, xs = numpy.nonzero(array)
+        if not ys.size:
+            continue
+        values = array[ys, xs].astype(table.dtype)
+        y_start, y_end = _nearest_bounds(array.shape[0], height)
+        x_start, x_end = _nearest_bounds(array.shape[1], width)
+        y1, y2, x1, x2 = y_start[ys], y_end[ys], x_start[xs], x_end[xs]
+        numpy.add.at(table, (y1, x1), values)
+        numpy.subtract.at(table, (y1, x2), values)
+        numpy.subtract.at(table, (y2, x1), values)
+        numpy.add.at(table, (y2, x2), values)
+    numpy.cumsum(table, axis=0, out=table)
+    numpy.cumsum(table, axis=1, out=table)
+    return table[:-1, :-1]
+
+
+
+_GAUSSIAN_KERNELS = {}
+
+_FFT_KERNELS = {}
+
+#Largest sigma to blur directly, before switching to FFT
+BLUR_DIRECT_MAX = 2
+
+#Smallest sigma to approximate with repeated box blurs
+#The error is around 2% of the highest value at this size, and gets smaller as the sigma increases
+BLUR_BOX_MIN = 200
+
+
+def _gaussian_kernel(sigma, truncate=4.0):
+    """Get a normalised 1D gaussian kernel, matching scipy.ndimage."""
+    key = (sigma, truncate)
+    try:
+        return _GAUSSIAN_KERNELS[key]
+    except KeyError:
+        pass
+    radius = int(truncate * sigma + 0.5)
+    x = numpy.arange(-radius, radius + 1, dtype=numpy.float64)
+    kernel = numpy.exp(-0.5 * (x / sigma) ** 2)
+    kernel /= kernel.sum()
+    _GAUSSIAN_KERNELS[key] = kernel
+    return kernel
+
+
+def _fft_length(n):
+    """Find the next length that only has factors of 2, 3 and 5."""
+    while True:
+        m = n
+        for factor in (2, 3, 5):
+            while not m % factor:
+                m //= factor
+        if m == 1:
+            return n
+        n += 1
+
+
+def _fft_kernel(sigma, truncate, length):
+    """Get the FFT of a gaussian kernel padded to a certain length."""
+    key = (sigma, truncate, length)
+    try:
+        return _FFT_KERNELS[key]
+    except KeyError:
+        pass
+    fft_kernel = numpy.fft.rfft(_gaussian_kernel(sigma, truncate), length)
+    _FFT_KERNELS[key] = fft_kernel
+    return fft_kernel
+
+
+def _pad(lines, radius):
+    """Pad the lines in the same way as the "reflect" mode of scipy.ndimage."""
+    return numpy.pad(lines, ((0, 0), (radius, radius)), mode='symmetric')
+
+
+def _blur_direct(lines, sigma, truncate):
+    """Blur each line by adding the shifted line for each value of the kernel."""
+    kernel = _gaussian_kernel(sigma, truncate)
+    size = lines.shape[1]
+    padded = _pad(lines, kernel.size // 2)
+    output = numpy.zeros(lines.shape, dtype=lines.dtype)
+    for i, weight in enumerate(kernel):
+        output += padded[:, i:i+size] * weight
+    return output
+
+
+def _blur_fft(lines, sigma, truncate, chunk_size=256):
+    """Blur each line with FFT convolution.
+    This is done in chunks to limit the memory used.
+    """
+    radius = _gaussian_kernel(sigma, truncate).size // 2
+    size = lines.shape[1]
+    length = _fft_length(size + 4 * radius)
+    fft_kernel = _fft_kernel(sigma, truncate, length)
+    
+    output = numpy.empty(lines.shape, dtype=lines.dtype)
+    for i in range(0, lines.shape[0], chunk_size):
+        padded = _pad(lines[i:i+chunk_size], radius)
+        convolved = numpy.fft.irfft(numpy.fft.rfft(padded, length) * fft_kernel, length)
+        output[i:i+chunk_size] = convolved[:, 2*radius:2*radius+size]
+    return output
+
+
+def _box_sizes(sigma, passes=3):
+    """Calculate the box widths that approximate a gaussian blur."""
+    ideal = (12 * sigma * sigma / passes + 1) ** 0.5
+    lower = int(ideal)
+    if not lower % 2:
+        lower -= 1
+    upper = lower + 2
+    lower_count = int(round((12 * sigma * sigma - passes * lower * lower - 4 * passes * lower - 3 * passes) / (-4 * lower - 4)))
+    return [lower if i < lower_count else upper for i in range(passes)]
+
+
+def _blur_box(lines, sigma):
+    """Approximate a gaussian blur on each line with repeated box blurs.
+    The time taken does not depend on the sigma.
+    """
+    size = lines.shape[1]
+    for width in _box_sizes(sigma):
+        cumulative = numpy.cumsum(_pad(lines, width // 2 + 1), axis=1, dtype=numpy.float64)
+        blurred = cumulative[:, width:width+size] - cumulative[:, :size]
+        blurred /= width
+        lines = blurred.astype(lines.dtype, copy=False)
+    return lines
+
+
+def blur_method(sigma):
+    """Get the gaussian blur method used by default for a sigma."""
+    if sigma <= BLUR_DIRECT_MAX:
+        return 'direct'
+    if sigma < BLUR_BOX_MIN:
+        return 'fft'
+    return 'box'
+
+
+def gaussian_blur(array, sigma, method=None, dtype=None, truncate=4.0):
+    """Apply a gaussian blur to a 2D array.
+    
+    The method can be 'direct', 'fft' or 'box', or left as None to pick
+    one based on the sigma. The direct and FFT methods give the same
+    result as scipy.ndimage.gaussian_filter in "reflect" mode.
+    The box method is an approximation for very large blurs, and is not
+    exact. The largest difference is a few percent of the highest value,
+    so only use it where that won't be noticed.
+    Set dtype to 'float32' to use half the memory.
+    """
+    array = _get_array(array).astype(_get_dtype(dtype) or numpy.float64)
+    if sigma <= 0:
+        return array
+    
+    if method is None:
+        method = blur_method(sigma)
+    
+    #Blur along each axis, moving it to the end as it's quicker to access
+    for axis in (0, 1):
+        lines = numpy.ascontiguousarray(numpy.moveaxis(array, axis, -1))
+        if method == 'direct':
+            lines = _blur_direct(lines, sigma, truncate)
+        elif method == 'fft':
+            lines = _blur_fft(lines, sigma, truncate)
+        elif method == 'box':
+            lines = _blur_box(lines, sigma)
+        else:
+            raise ValueError('unknown blur method: {}'.format(method))
+        array = numpy.moveaxis(lines, -1, axis)
+    return numpy.ascontiguousarray(array)
+
 class LazyLoader(object):
     """Store the file path and array index, and only load when required.
     Reduces memory usage by up to 90%, and significantly speeds up loading.
+
+    If mmap is set and the array was saved without compression,
+    it will be read straight from the file instead of being loaded.
     """
-    def __init__(self, path, index, resolution=None):
+    def __init__(self, path, index, resolution=None, tile_size=0, mmap=False):
         
         self.path = path
         self.index = index
+        self.tile_size = tile_size
+        self.mmap = mmap
+        self.source = None
+
+        #Count the edits, so it's known if the array matches the file
+        self.generation = 0
+        self.saved_generation = 0
 
         self._array = None
         self._raw = None
         self._resolution = tuple(resolution) if resolution is not None else None
     
+    def __getstate__(self):
+        """Only include the array if it has been modified.
+        Saved arrays are read from the file again, such as in another process.
+        """
+        state = self.__dict__.copy()
+        state['source'] = None
+        if not self.modified:
+            state['_array'] = None
+        return state
+    
     def _load(self, as_numpy=True):
         """Load from zip file."""
-        with CustomOpen(self.path, 'rb') as f:
+        if as_numpy and self.mmap:
+            try:
+                array = self._memmap()
+            except (IOError, KeyError, ValueError):
+                array = None
+            if array is not None:
+                return array
+            
+        with cached_open(self.path) as f:
             try:
                 array = f.read('maps/{}.npy'.format(self.index))
             except KeyError:
@@ -263,6 +752,46 @@ class LazyLoader(object):
         else:
             return array
 
+    def _memmap(self):
+        """Map the array from the file if it isn't compressed.
+        This uses copy-on-write, so any edits will only be kept in memory.
+        """
+        with cached_open(self.path) as f:
+            if f.zip is None:
+                return None
+            offset = f.offset('maps/{}.npy'.format(self.index))
+            if offset is None:
+                return None
+            
+            #Read the header to find where the array starts
+            f.zip.fp.seek(offset)
+            version = numpy.lib.format.read_magic(f.zip.fp)
+            if version == (1, 0):
+                shape, fortran_order, dtype = numpy.lib.format.read_array_header_1_0(f.zip.fp)
+            else:
+                shape, fortran_order, dtype = numpy.lib.format.read_array_header_2_0(f.zip.fp)
+            offset = f.zip.fp.tell()
+        
+            if dtype.hasobject or not numpy.prod(shape):
+                return None
+            return numpy.memmap(self.path, dtype=dtype, mode='c', offset=offset, shape=shape, order='F' if fortran_order else 'C')
+
+    @property
+    def modified(self):
+        """Return True if the array has been edited since it was saved."""
+        return self.generation != self.saved_generation
+
+    def edited(self):
+        """Mark the array as edited."""
+        self.generation += 1
+
+    def saved(self):
+        """Mark the array as saved if it hasn't been edited since it was copied.
+        This is only used on copies, and will update the original class.
+        """
+        if self.source is not None:
+            self.source.saved_generation = self.generation
+
     @property
     def is_loaded(self):
         """Return True or False if the array is currently loaded."""
@@ -273,11 +802,14 @@ class LazyLoader(object):
         """Load array if it doesn't exist or just return it."""
         if not self.is_loaded:
             self._array = self._load()
+            if self.tile_size:
+                self._array = TiledArray.from_array(self._array, self.tile_size)
         
         #If the resolution was somehow created wrongly, then set a new one
         loaded_resolution = tuple(map(int, self._array.shape[::-1]))
         if self._resolution is not None and loaded_resolution != self._resolution:
-            self._array = array(self._resolution, create=True, dtype=self._array.dtype)
+            self._array = array(self._resolution, create=True, dtype=self._array.dtype, tile_size=self.tile_size)
+            self.edited()
 
         return self._array
 
@@ -286,10 +818,35 @@ class LazyLoader(object):
 
     def __setitem__(self, item, value):
         self.array[item] = value
+        self.edited()
     
+    def copy(self):
+        """Copy the class, and the array if it has been modified.
+        Unmodified arrays will be read from the file again if needed.
+        """
+        new = LazyLoader(self.path, self.index, resolution=self._resolution, tile_size=self.tile_size, mmap=self.mmap)
+        new.source = self
+        new.generation = self.generation
+        if self.modified:
+            new._array = copy(self._array)
+        else:
+            new.saved_generation = self.generation
+        return new
+
+    def copy_to(self, f, filename, codec=None, level=None, align=0):
+        """Copy the saved array to another zip file without loading it.
+        See CustomOpen.copy for the arguments.
+        """
+        with cached_open(self.path) as source:
+            try:
+                return f.copy(source, 'maps/{}.npy'.format(self.index), filename, codec=codec, level=level, align=align)
+            except KeyError:
+                return f.copy(source, self.index, filename, codec=codec, level=level, align=align)
+
     def clear(self):
         """Clear the array from memory."""
         self._array = None
+        self.saved_generation = self.generation
 
     def pop(self, raw=False):
         """Return the array and free up memory."""
@@ -325,4 +882,189 @@ class LazyLoader(object):
         return self.array.any()
 
     def all(self):
-        return self.array.all()
\ No newline at end of file
+        return self.array.all()
+
+
+class TiledArray(object):
+    """Split a 2D array into a grid of tiles, and only create each tile when it is written to.
+    Most of a map is never visited, so this can use a fraction of the memory on large resolutions.
+
+    Reading and writing is only supported by (y, x) indexes.
+    For anything else, the array property will build the full numpy array.
+    """
+    def __init__(self, shape, dtype=None, tile_size=128):
+        self.shape = tuple(map(int, shape))
+        self.dtype = numpy.dtype(dtype)
+        self.tile_size = int(tile_size)
+        self.tiles = {}
+
+    @classmethod
+    def from_array(cls, array, tile_size=128):
+        """Convert a numpy array, keeping only the tiles containing data."""
+        new = cls(array.shape, dtype=array.dtype, tile_size=tile_size)
+        for y in range(0, new.shape[0], new.tile_size):
+            for x in range(0, new.shape[1], new.tile_size):
+                tile = array[y:y+new.tile_size, x:x+new.tile_size]
+                if tile.any():
+                    new.tiles[(y // new.tile_size, x // new.tile_size)] = tile.copy()
+        return new
+
+    @property
+    def array(self):
+        """Build the full numpy array."""
+        output = numpy.zeros(self.shape, dtype=self.dtype)
+        for (y, x), tile in self.tiles.items():
+            y *= self.tile_size
+            x *= self.tile_size
+            output[y:y+tile.shape[0], x:x+tile.shape[1]] = tile
+        return output
+
+    @property
+    def nbytes(self):
+        """Get the memory used by the tiles."""
+        total = 0
+        for tile in self.tiles.values():
+            total += tile.nbytes
+        return total
+
+    def _tile(self, tile_y, tile_x, create=True):
+        """Get a tile, or create it if it doesn't exist yet."""
+        try:
+            return self.tiles[(tile_y, tile_x)]
+        except KeyError:
+            if not create:
+                return None
+            y = tile_y * self.tile_size
+            x = tile_x * self.tile_size
+            #Tiles on the edges are clipped to the size of the array
+            height = self.shape[0] - y if self.shape[0] - y < self.tile_size else self.tile_size
+            width = self.shape[1] - x if self.shape[1] - x < self.tile_size else self.tile_size
+            tile = self.tiles[(tile_y, tile_x)] = numpy.zeros((height, width), dtype=self.dtype)
+            return tile
+
+    def _group_indices(self, indices):
+        """Group (y, x) indexes by which tile they belong to.
+        Yields the tile position, the local indexes, and which of the original indexes were used.
+        """
+        ys, xs = (numpy.asarray(i, dtype=numpy.int64).ravel() for i in indices)
+
+        #Follow the same rules as numpy for negative and invalid indexes
+        height, width = self.shape
+        ys = numpy.where(ys < 0, ys + height, ys)
+        xs = numpy.where(xs < 0, xs + width, xs)
+        if ys.size and (ys.min() < 0 or ys.max() >= height or xs.min() < 0 or xs.max() >= width):
+            raise IndexError('index out of bounds for shape {}'.format(self.shape))
+
+        tile_ys, local_ys = numpy.divmod(ys, self.tile_size)
+        tile_xs, local_xs = numpy.divmod(xs, self.tile_size)
+        
+        #Most paths only cross a few tiles, so sort and split instead of masking every index
+        keys = tile_ys * ((width - 1) // self.tile_size + 1) + tile_xs
+        order = numpy.argsort(keys, kind='stable')
+        boundaries = numpy.flatnonzero(numpy.diff(keys[order])) + 1
+        for group in numpy.split(order, boundaries):
+            if group.size:
+                yield (int(tile_ys[group[0]]), int(tile_xs[group[0]])), (local_ys[group], local_xs[group]), group
+
+    def _values(self, value, group):
+        """Get the values for a group of indexes."""
+        if numpy.ndim(value):
+            return numpy.asarray(value).ravel()[group]
+        return value
+
+    def assign(self, indices, value):
+        """Set every (y, x) index to a value."""
+        for (tile_y, tile_x), local_indices, group in self._group_indices(indices):
+            self._tile(tile_y, tile_x)[local_indices] = self._values(value, group)
+
+    def maximum_at(self, indices, value):
+        """Set every (y, x) index to the max of the value and what it currently is."""
+        for (tile_y, tile_x), local_indices, group in self._group_indices(indices):
+            numpy.maximum.at(self._tile(tile_y, tile_x), local_indices, self._values(value, group))
+
+    def add_at(self, indices, value):
+        """Add a value to every (y, x) index."""
+        for (tile_y, tile_x), local_indices, group in self._group_indices(indices):
+            numpy.add.at(self._tile(tile_y, tile_x), local_indices, self._values(value, group))
+
+    def copy(self):
+        new = TiledArray(self.shape, dtype=self.dtype, tile_size=self.tile_size)
+        for key, tile in self.tiles.items():
+            new.tiles[key] = tile.copy()
+        return new
+
+    def set_type(self, dtype):
+        """Convert every tile to a new dtype."""
+        self.dtype = numpy.dtype(dtype)
+        for key, tile in self.tiles.items():
+            self.tiles[key] = tile.astype(self.dtype)
+
+    def map(self, func, *args, **kwargs):
+        """Run a function on every tile and return the result as a new TiledArray.
+        The function must not change any zero values, as empty tiles are skipped.
+        """
+        new = TiledArray(self.shape, dtype=self.dtype, tile_size=self.tile_size)
+        for key, tile in self.tiles.items():
+            new.tiles[key] = func(tile, *args, **kwargs)
+        for tile in new.tiles.values():
+            new.dtype = tile.dtype
+            break
+        return new
+
+    def __getitem__(self, item):
+        try:
+            is_index = len(item) == 2
+        except TypeError:
+            is_index = False
+        if not is_index:
+            return self.array[item]
+        
+        #Read values, leaving any missing tiles as 0
+        try:
+            output = numpy.zeros(numpy.size(item[0]), dtype=self.dtype)
+            for (tile_y, tile_x), local_indices, group in self._group_indices(item):
+                tile = self._tile(tile_y, tile_x, create=False)
+                if tile is not None:
+                    output[group] = tile[local_indices]
+        
+        #Fallback for anything such as slices
+        except (TypeError, ValueError):
+            return self.array[item]
+        
+        if numpy.ndim(item[0]) == numpy.ndim(item[1]) == 0:
+            return output[0]
+        return output
+
+    def __setitem__(self, item, value):
+        try:
+            if len(item) != 2:
+                raise TypeError
+        except TypeError:
+            raise TypeError('TiledArray only supports setting values with (y, x) indexes')
+        self.assign(item, value)
+
+    def any(self):
+        return any(tile.any() for tile in self.tiles.values())
+
+    def all(self):
+        return self.array.all()
+
+    #Any maths will return a normal numpy array
+    def __truediv__(self, n):
+        return self.array.__truediv__(n)
+
+    def __floordiv__(self, n):
+        return self.array.__floordiv__(n)
+
+    def __div__(self, n):
+        return self.array.__div__(n)
+    
+    def __add__(self, n):
+        return self.array + n
+    __radd__ = __add__
+    
+    def __sub__(self, n):
+        return self.array - n
+
+    def __rsub__(self, n):
+        return n - self.array
@@ -0,0 +1,174 @@
+"""This is part of the Mouse Tracks Python application.
+Source: https://github.com/Peter92/MouseTracks
+"""
+#Queue between two processes using a ring buffer in shared memory
+#Requires Python 3.8 or above, otherwise multiprocessing.Queue should be used
+
+from __future__ import absolute_import, division
+
+import struct
+import time
+
+from .compatibility import pickle
+
+try:
+    from multiprocessing import shared_memory
+except ImportError:
+    shared_memory = None
+
+
+#Write position, read position, messages written, messages read
+_HEADER = struct.Struct('<4Q')
+
+_LENGTH = struct.Struct('<I')
+
+PICKLE_PROTOCOL = min(pickle.HIGHEST_PROTOCOL, 2)
+
+
+class Empty(Exception):
+    pass
+
+
+class RingBuffer(object):
+    """Single producer, single consumer queue without any locks.
+    Messages are pickled and written to one or more fixed size records.
+    The producer only ever writes the write position and message count,
+    and the consumer only ever writes the read position and message count,
+    so as long as only one process puts and one process gets, no locks are needed.
+
+    The object can be passed to a new process, which will attach to the same memory.
+    """
+    supported = shared_memory is not None
+
+    def __init__(self, size=1048576, record_size=64):
+        if not self.supported:
+            raise NotImplementedError('shared memory requires Python 3.8 or above')
+        self.record_size = record_size
+        self.capacity = max(1, size // record_size) * record_size
+        self._memory = shared_memory.SharedMemory(create=True, size=_HEADER.size + self.capacity)
+        self._owner = True
+        _HEADER.pack_into(self._memory.buf, 0, 0, 0, 0, 0)
+
+    def __getstate__(self):
+        return {'name': self._memory.name, 'capacity': self.capacity, 'record_size': self.record_size}
+
+    def __setstate__(self, state):
+        self.capacity = state['capacity']
+        self.record_size = state['record_size']
+        self._memory = _attach(state['name'])
+        self._owner = False
+
+    def _header(self):
+        return _HEADER.unpack_from(self._memory.buf, 0)
+
+    def _copy_in(self, position, data):
+        """Write data to the buffer, wrapping around to the start if needed."""
+        buf = self._memory.buf
+        position %= self.capacity
+        end = min(len(data), self.capacity - position)
+        buf[_HEADER.size + position:_HEADER.size + position + end] = data[:end]
+        if end < len(data):
+            buf[_HEADER.size:_HEADER.size + len(data) - end] = data[end:]
+
+    def _copy_out(self, position, length):
+        """Read data from the buffer, wrapping around to the start if needed."""
+        buf = self._memory.buf
+        position %= self.capacity
+        end = min(length, self.capacity - position)
+        data = bytes(buf[_HEADER.size + position:_HEADER.size + position + end])
+        if end < length:
+            data += bytes(buf[_HEADER.size:_HEADER.size + length - end])
+        return data
+
+    def _record_length(self, length):
+        """Get the space used by a message, rounded up to the record size."""
+        return -(-(_LENGTH.size + length) // self.record_size) * self.record_size
+
+    def put(self, message, block=True, timeout=None):
+        """Add a message to the queue.
+        If the buffer is full, this will wait for the consumer to catch up.
+        """
+        data = pickle.dumps(message, PICKLE_PROTOCOL)
+        record_length = self._record_length(len(data))
+        if record_length > self.capacity:
+            raise ValueError('message of {} bytes is too large for the buffer'.format(len(data)))
+
+        write_position, read_position, put_count, _ = self._header()
+        if write_position + record_length - read_position > self.capacity:
+            for _ in _wait(block, timeout):
+                if write_position + record_length - self._header()[1] <= self.capacity:
+                    break
+            else:
+                raise IOError('ring buffer is full')
+
+        #The length is at the start of a record, so it never needs wrapping
+        _LENGTH.pack_into(self._memory.buf, _HEADER.size + write_position % self.capacity, len(data))
+        self._copy_in(write_position + _LENGTH.size, data)
+
+        #Update the count first, so qsize never returns less than 0
+        struct.pack_into('<Q', self._memory.buf, 16, put_count + 1)
+        struct.pack_into('<Q', self._memory.buf, 0, write_position + record_length)
+
+    def get(self, block=True, timeout=None):
+        """Remove and return a message from the queue."""
+        write_position, read_position, _, get_count = self._header()
+        if write_position == read_position:
+            for _ in _wait(block, timeout):
+                if self._header()[0] != read_position:
+                    break
+            else:
+                raise Empty
+
+        length = _LENGTH.unpack_from(self._memory.buf, _HEADER.size + read_position % self.capacity)[0]
+        data = self._copy_out(read_position + _LENGTH.size, length)
+        struct.pack_into('<Q', self._memory.buf, 8, read_position + self._record_length(length))
+        struct.pack_into('<Q', self._memory.buf, 24, get_count + 1)
+        return pickle.loads(data)
+
+    def qsize(self):
+        write_position, read_position, put_count, get_count = self._header()
+        return put_count - get_count
+
+    def empty(self):
+        write_position, read_position, _, _ = self._header()
+        return write_position == read_position
+
+    def close(self):
+        """Detach from the shared memory, and free it if this created it."""
+        self._memory.close()
+        if self._owner:
+            self._memory.unlink()
+
+
+def _attach(name):
+    """Attach to existing shared memory without letting this process free it on exit."""
+    try:
+        return shared_memory.SharedMemory(name=name, track=False)
+
+    #Before Python 3.13, stop the resource tracker from recording it while attaching
+    except TypeError:
+        try:
+            from multiprocessing import resource_tracker
+        except ImportError:
+            return shared_memory.SharedMemory(name=name)
+        register = resource_tracker.register
+        resource_tracker.register = lambda *args, **kwargs: None
+        try:
+            return shared_memory.SharedMemory(name=name)
+        finally:
+            resource_tracker.register = register
+
+
+def _wait(block, timeout):
+    """Yield until the timeout is reached, sleeping longer each time.
+    Only yields once if not blocking.
+    """
+    yield
+    if not block:
+        return
+    start = time.time()
+    delay = 0.0001
+    while timeout is None or time.time() - start < timeout:
+        time.sleep(delay)
+        delay = min(delay * 2, 0.01)
+        yield
@@ -24,7 +24,7 @@ class IterateMaps(object):
     def __init__(self, maps):
         self.maps = maps
 
-    def _iterate(self, maps, command, extra=None, _legacy=False, _lazy_load_path=None, _resolution=None):
+    def _iterate(self, maps, command, extra=None, _legacy=False, _lazy_load_path=None, _resolution=None, _tile_size=0, _mmap=False):
         for key, value in iteritems(maps):
 
             if isinstance(key, tuple):
@@ -36,7 +36,7 @@ class IterateMaps(object):
 
             #New format when each resolution contains all the maps
             elif not _legacy and isinstance(value, dict):
-                self._iterate(value, command, extra, _legacy=_legacy, _lazy_load_path=_lazy_load_path, _resolution=_resolution)
+                self._iterate(value, command, extra, _legacy=_legacy, _lazy_load_path=_lazy_load_path, _resolution=_resolution, _tile_size=_tile_size, _mmap=_mmap)
 
             #Separate the numpy arrays from the data
             elif command == 'separate':
@@ -48,8 +48,10 @@ class IterateMaps(object):
             elif command == 'join':
                 if _lazy_load_path is None:
                     maps[key] = extra[value]
+                    if _tile_size and not isinstance(maps[key], (numpy.LazyLoader, numpy.TiledArray)):
+                        maps[key] = numpy.TiledArray.from_array(maps[key], _tile_size)
                 else:
-                    maps[key] = numpy.LazyLoader(_lazy_load_path, value, resolution=_resolution)
+                    maps[key] = numpy.LazyLoader(_lazy_load_path, value, resolution=_resolution, tile_size=_tile_size, mmap=_mmap)
 
             #Convert dicts to numpy arrays (only used on old files)
             elif command == 'convert' and _legacy:
@@ -65,9 +67,12 @@ class IterateMaps(object):
         self._iterate(self.maps, 'separate')
         return self._map_list
 
-    def join(self, numpy_maps, _legacy=False, _lazy_load_path=None):
-        """Merge with the numpy maps again."""
-        self._iterate(self.maps, 'join', numpy_maps, _legacy=_legacy, _lazy_load_path=_lazy_load_path)
+    def join(self, numpy_maps, _legacy=False, _lazy_load_path=None, _tile_size=0, _mmap=False):
+        """Merge with the numpy maps again.
+        If _tile_size is set, any maps will be converted to tiled arrays.
+        If _mmap is set, lazy loaded maps will be read straight from the file where possible.
+        """
+        self._iterate(self.maps, 'join', numpy_maps, _legacy=_legacy, _lazy_load_path=_lazy_load_path, _tile_size=_tile_size, _mmap=_mmap)
 
     def convert(self):
         """Convert the old map dictionaries to numpy arrays."""
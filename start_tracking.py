@@ -20,6 +20,7 @@ if __name__ == '__main__':
     if CONFIG.is_new:
         pass
 
+    #The web server is imported when tracking starts, as Flask is slow to load
     no_gui = tray is None or not CONFIG['API']['WebServer']
     
     #Elevate and quit the process